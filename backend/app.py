@@ -1,25 +1,43 @@
 import requests
 import urllib.parse
 import json
-import base64
 import numpy as np
+from numba import njit
+from pybase64 import b64decode  # SIMD-accelerated base64 for uploaded images
 import random
 import datetime
+import functools
+import dataclasses
+import hashlib
+import itertools
+import logging
 import os
-from io import BytesIO
-from PIL import Image
+import secrets
+from typing import NamedTuple
+from concurrent.futures import ThreadPoolExecutor
 from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
-from werkzeug.security import generate_password_hash, check_password_hash
-from werkzeug.exceptions import BadRequest, Unauthorized, Forbidden, NotFound, MethodNotAllowed, Conflict
-from flask import Flask, request, jsonify, redirect
+from werkzeug.middleware.proxy_fix import ProxyFix
+from werkzeug.exceptions import BadRequest, Unauthorized, Forbidden, NotFound, MethodNotAllowed, Conflict, HTTPException
+from flask import Flask, request, redirect, url_for
 from flask_cors import CORS
+from sqlalchemy import and_, event, inspect, select, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only, raiseload
+from sqlalchemy.schema import CreateColumn
 from config import Config
-from models import db, User, EmotionLog, VoiceCommandLog, GestureLog, Playlist, PlaylistSong, LikedSong, SongHistory
-from utils.spotify import get_playlist_for_emotion, get_spotify_token
+from models import db, User, UserAvatar, EmotionLog, VoiceCommandLog, GestureLog, Playlist, PlaylistSong, LikedSong, SongHistory
+from utils.spotify import get_playlist_for_emotion, get_spotify_token, spotify_get_async, spotify_get_conditional, spotify_get_items, spotify_get_items_many, spotify_get_many, spotify_json, spotify_session
+from utils.cache import cached_response, cache_response, delete_cached, fallback_response, get_cached, set_cached
+from utils.responses import dumps, init_json_provider, json_response, private_json_response
+from utils.logging_setup import configure_logging
+from utils.log_buffer import buffer_log, flush_log_buffer, init_log_buffer
+from utils.passwords import hash_password, needs_rehash, verify_password
+from utils.query_counter import init_query_counter
 
 # Try to import FER for emotion detection (optional - will fallback if not available)
 try:
     from fer import FER
+    import cv2  # FER depends on OpenCV, so it is available whenever FER is
     FER_AVAILABLE = True
 except ImportError:
     FER_AVAILABLE = False
@@ -27,8 +45,33 @@ except ImportError:
 
 fer_detector = None
 
+# Column order of the per-face score matrix passed to top_face_emotion
+FER_LABELS = ("angry", "disgust", "fear", "happy", "sad", "surprise", "neutral")
+
+
+@njit(cache=True, fastmath=True)
+def top_face_emotion(scores):
+    """Return (face_index, label_index, score) of the highest score in a (faces, 7) matrix"""
+    best = -1.0
+    best_face = 0
+    best_label = 0
+    for i in range(scores.shape[0]):
+        for j in range(scores.shape[1]):
+            if scores[i, j] > best:
+                best = scores[i, j]
+                best_face = i
+                best_label = j
+    return best_face, best_label, best
+
+
+# Prime the JIT cache at import so the first request doesn't pay for compilation
+top_face_emotion(np.zeros((1, len(FER_LABELS)), dtype=np.float32))
+
 app = Flask(__name__)
+# Trust the platform proxy's X-Forwarded-Proto so external URLs (e.g. profile pictures) use https
+app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1)
 app.config.from_object(Config)
+init_json_provider(app)
 # CORS(app, origins=["http://localhost:3000", "http://127.0.0.1:3000"], supports_credentials=True)
 frontend_url = os.getenv("FRONTEND_URL", "http://localhost:3000")
 # Explicitly add the Vercel URL to avoid Env Var mistakes
@@ -42,14 +85,154 @@ allowed_origins = [
 CORS(app, origins=allowed_origins, supports_credentials=True)
 
 db.init_app(app)
+init_log_buffer(app)
+init_query_counter(app)
 jwt = JWTManager(app)
+configure_logging()
+logger = logging.getLogger(__name__)
+
+
+@jwt.token_in_blocklist_loader
+def token_user_unavailable(jwt_header, jwt_payload):
+    """Refuse tokens of accounts being deleted (marked in the cache by delete_account, so no DB query)"""
+    return get_cached(f"user:{jwt_payload['sub']}:deleting") is not None
+
+# Keep-alive session for the Google OAuth calls (Spotify calls share utils.spotify.spotify_session)
+google_session = requests.Session()
+
+SPOTIFY_SEARCH_URL = "https://api.spotify.com/v1/search?q=%s&type=%s&limit=%d"
+SPOTIFY_ARTISTS_URL = "https://api.spotify.com/v1/artists?ids=%s"
+SPOTIFY_NEW_RELEASES_URL = "https://api.spotify.com/v1/browse/new-releases?limit=15"
+
+AVAILABLE_LANGUAGES = ["Hindi", "English", "Bengali", "Marathi", "Telugu", "Tamil", "Global"]
+# Languages come from a fixed set, so their URL-quoted " <language>" suffix is computed once
+QUOTED_LANG_SUFFIX = {lang: urllib.parse.quote(" " + lang) for lang in AVAILABLE_LANGUAGES}
+QUOTED_LANG_SUFFIX["Global"] = ""  # Global searches without a language restriction
+
+
+def pick_image(images, fallback=None, index=1):
+    """URL of images[index] (Spotify's medium size), else the first image, else fallback"""
+    if len(images) > index:
+        return images[index].get("url")
+    return images[0].get("url") if images else fallback
+
+
+@dataclasses.dataclass
+class SongCard:
+    """Song/album card returned by the song list endpoints (orjson serializes dataclasses natively)"""
+    __slots__ = ("id", "title", "subtitle", "imageUrl", "album", "artist", "spotifyId", "spotifyUri", "spotifyUrl")
+    id: str
+    title: str
+    subtitle: str
+    imageUrl: str
+    album: str
+    artist: str
+    spotifyId: str
+    spotifyUri: str
+    spotifyUrl: str
+
+
+@dataclasses.dataclass
+class SpotifySongCard(SongCard):
+    """SongCard that also reports where it came from"""
+    __slots__ = ("source",)
+    source: str
+
+
+def join_artist_names(artists):
+    """Comma-separated artist names, or "Unknown" when there are none"""
+    return ", ".join(a["name"] for a in artists if a["name"]) or "Unknown"
+
+
+def spotify_album_links(album_id):
+    """(spotifyUri, spotifyUrl) for an album"""
+    return "spotify:album:%s" % album_id, "https://open.spotify.com/album/%s" % album_id
+
+
+def spotify_track_url(track_id):
+    """Open-in-Spotify URL for a track"""
+    return "https://open.spotify.com/track/%s" % track_id
+
+
+def album_song_items(albums, limit=15):
+    """Map up to limit new-release albums to song cards that open the album (users can see all its tracks)"""
+    items = []
+    for album in itertools.islice(albums, limit):
+        artists = album.get("artists", [])
+        artist_name = join_artist_names(artists)
+        album_id = album.get("id")
+        spotify_uri, spotify_url = spotify_album_links(album_id)
+        items.append(SongCard(
+            id=album_id,
+            title=album.get("name"),
+            subtitle=artist_name,
+            imageUrl=pick_image(album.get("images") or (), None, 0),
+            album=album.get("name"),
+            artist=artist_name,
+            spotifyId=album_id,
+            spotifyUri=spotify_uri,
+            spotifyUrl=spotify_url
+        ))
+    return items
+
+
+def track_song_items(tracks, image_index=1, limit=15):
+    """Map up to limit search-result tracks to song cards, skipping repeated track IDs"""
+    items = []
+    seen_track_ids = set()
+    for track in itertools.islice(tracks, limit):
+        track_id = track.get("id")
+        if track_id in seen_track_ids:
+            continue
+        seen_track_ids.add(track_id)
+        
+        album = track.get("album", {})
+        artists = track.get("artists", [])
+        artist_name = join_artist_names(artists)
+        items.append(SongCard(
+            id=track_id,
+            title=track.get("name"),
+            subtitle=artist_name,
+            imageUrl=pick_image(album.get("images") or (), None, image_index),
+            album=album.get("name"),
+            artist=artist_name,
+            spotifyId=track_id,
+            spotifyUri=track.get("uri"),
+            spotifyUrl=spotify_track_url(track_id)
+        ))
+    return items
+
+def public_track_item(track_id, track):
+    """Map an accepted Spotify track to the public song card (only called after dedup)"""
+    album = track.get("album") or {}
+    artists = track.get("artists") or ()
+    artist_name = join_artist_names(artists)
+    return SpotifySongCard(
+        id=track_id,
+        title=track.get("name"),
+        subtitle=artist_name,
+        imageUrl=pick_image(album.get("images", ()), "/images/song-1.png"),
+        album=album.get("name"),
+        artist=artist_name,
+        spotifyId=track_id,
+        spotifyUri=track.get("uri"),
+        spotifyUrl=spotify_track_url(track_id),
+        source="Spotify"
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def quote_emotion(emotion):
+    """URL-quote an emotion search term (emotion strings repeat, so results are cached)"""
+    return urllib.parse.quote(emotion)
+
 
 # ======================================================
 # 0️⃣  Health Check
 # ======================================================
 @app.route('/')
 def home():
-    return jsonify({"message": "Mood-Based Music API is live!"}), 200
+    return json_response({"message": "Mood-Based Music API is live!"}), 200
 
 
 # ======================================================
@@ -59,27 +242,32 @@ def home():
 def register():
     data = request.get_json()
     if not data.get("email") or not data.get("password"):
-        return jsonify({"error": "Email and password required"}), 400
+        return json_response({"error": "Email and password required"}), 400
 
     if User.query.filter_by(email=data["email"]).first():
-        return jsonify({"error": "User already exists"}), 409
+        return json_response({"error": "User already exists"}), 409
 
-    hashed_pw = generate_password_hash(data["password"])
+    hashed_pw = hash_password(data["password"])
     new_user = User(email=data["email"], password=hashed_pw, consent_given=True)
     db.session.add(new_user)
     db.session.commit()
-    return jsonify({"message": "User registered successfully"}), 201
+    return json_response({"message": "User registered successfully"}), 201
 
 
 @app.route('/login', methods=['POST'])
 def login():
     data = request.get_json()
     user = User.query.filter_by(email=data.get("email")).first()
-    if not user or not check_password_hash(user.password, data.get("password")):
-        return jsonify({"error": "Invalid credentials"}), 401
+    if not user or user.is_deleting or not verify_password(user.password, data.get("password")):
+        return json_response({"error": "Invalid credentials"}), 401
+    
+    # Upgrade older PBKDF2 hashes while the plaintext is at hand
+    if needs_rehash(user.password):
+        user.password = hash_password(data["password"])
+        db.session.commit()
 
     token = create_access_token(identity=str(user.id))
-    return jsonify({"token": token}), 200
+    return json_response({"token": token}), 200
 
 
 @app.route('/api/me', methods=['GET'])
@@ -89,16 +277,16 @@ def get_me():
     user_id = get_jwt_identity()
     user = User.query.get(user_id)
     if not user:
-        return jsonify({"error": "User not found"}), 404
+        return json_response({"error": "User not found"}), 404
 
-    return jsonify({
+    return json_response({
         "id": user.id,
         "email": user.email,
         "first_name": user.first_name,
         "username": user.username,
         "phone_number": user.phone_number,
         "bio": user.bio,
-        "profile_picture_url": user.profile_picture_url,
+        "profile_picture_url": resolve_picture_url(user.profile_picture_url),
         "spotifyLinked": bool(user.spotify_access_token),
         "spotifyUser": {
             "id": user.spotify_id,
@@ -117,9 +305,83 @@ def get_me():
 # ======================================================
 # 2️⃣  Spotify Integration
 # ======================================================
+def spotify_token_expiry(token_data):
+    """Absolute UTC expiry time for a Spotify token response"""
+    return datetime.datetime.utcnow() + datetime.timedelta(seconds=token_data.get("expires_in", 3600))
+
+
+# Columns the Spotify browse endpoints read from the user (language plus ensure_valid_spotify_token's fields)
+SPOTIFY_USER_COLUMNS = (User.language, User.spotify_access_token, User.spotify_refresh_token, User.spotify_token_expires_at)
+
+
+def load_user(user_id, *columns):
+    """Load a user with only the given columns; relationships raise instead of lazy-loading"""
+    return db.session.get(User, int(user_id), options=[load_only(*columns), raiseload('*')])
+
+
+def get_spotify_user(user_id):
+    """Load a user with only the columns needed for Spotify lookups"""
+    return load_user(user_id, *SPOTIFY_USER_COLUMNS)
+
+
+# Preferences/profile responses are read on almost every page load, so they are cached until the user changes them.
+# Only Redis is used: an in-process copy could not be invalidated by writes handled in other workers.
+USER_CACHE_TTL = 300
+
+
+def invalidate_user_cache(user_id):
+    """Drop the user's cached preferences/profile responses once the current transaction commits"""
+    db.session.info.setdefault("stale_user_ids", set()).add(user_id)
+
+
+@event.listens_for(db.session, "after_commit")
+def drop_stale_user_caches(session):
+    for user_id in session.info.pop("stale_user_ids", ()):
+        delete_cached(f"user:{user_id}:prefs", f"user:{user_id}:profile")
+
+
+@event.listens_for(db.session, "after_rollback")
+def forget_stale_user_caches(session):
+    session.info.pop("stale_user_ids", None)
+
+
+def transactional(conflict_message=None):
+    """Run a view as one transaction: commit after a successful response, roll back on an error response.
+
+    Exceptions roll back and propagate to the app's error handlers, except a unique-constraint
+    violation, which becomes a 409 with conflict_message when one is given.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                response = view(*args, **kwargs)
+                status = response[1] if isinstance(response, tuple) else 200
+                if status < 400:
+                    db.session.commit()
+                else:
+                    db.session.rollback()
+                return response
+            except IntegrityError:
+                db.session.rollback()
+                if conflict_message:
+                    return json_response({"error": conflict_message}), 409
+                raise
+            except Exception:
+                db.session.rollback()
+                raise
+        return wrapper
+    return decorator
+
+
 def ensure_valid_spotify_token(user):
     """Auto-refresh Spotify access token if expired"""
-    test_resp = requests.get(
+    # Skip the /v1/me probe while the stored token is known to be fresh
+    expires_at = user.spotify_token_expires_at
+    if expires_at and expires_at - datetime.datetime.utcnow() > datetime.timedelta(seconds=60):
+        return
+
+    test_resp = spotify_session.get(
         "https://api.spotify.com/v1/me",
         headers={"Authorization": f"Bearer {user.spotify_access_token}"}
     )
@@ -131,11 +393,12 @@ def ensure_valid_spotify_token(user):
             "client_id": app.config["SPOTIFY_CLIENT_ID"],
             "client_secret": app.config["SPOTIFY_CLIENT_SECRET"]
         }
-        response = requests.post(token_url, data=payload, headers={"Content-Type": "application/x-www-form-urlencoded"})
+        response = spotify_session.post(token_url, data=payload, headers={"Content-Type": "application/x-www-form-urlencoded"})
         token_data = response.json()
         new_access_token = token_data.get("access_token")
         if new_access_token:
             user.spotify_access_token = new_access_token
+            user.spotify_token_expires_at = spotify_token_expiry(token_data)
             db.session.commit()
             print("🔄 Spotify access token refreshed successfully.")
 
@@ -156,7 +419,7 @@ def get_spotify_login_url():
     }
     query_string = urllib.parse.urlencode(params)
     spotify_url = f"{auth_url}?{query_string}"
-    return jsonify({"url": spotify_url}), 200
+    return json_response({"url": spotify_url}), 200
 
 
 @app.route('/spotify/login')
@@ -182,7 +445,7 @@ def google_login_initiate():
     """Initiate Google OAuth for login/signup (no JWT required)"""
     # Check if Google credentials are configured
     if not app.config.get("GOOGLE_CLIENT_ID") or not app.config.get("GOOGLE_CLIENT_SECRET") or not app.config.get("GOOGLE_REDIRECT_URI"):
-        return jsonify({"error": "Google credentials not configured"}), 500
+        return json_response({"error": "Google credentials not configured"}), 500
     
     auth_url = "https://accounts.google.com/o/oauth2/v2/auth"
     redirect_uri = app.config["GOOGLE_REDIRECT_URI"]
@@ -198,7 +461,7 @@ def google_login_initiate():
     }
     query_string = urllib.parse.urlencode(params)
     google_url = f"{auth_url}?{query_string}"
-    return jsonify({"url": google_url}), 200
+    return json_response({"url": google_url}), 200
 
 
 @app.route('/spotify/callback')
@@ -208,7 +471,7 @@ def spotify_callback():
     state = request.args.get("state")  # Contains user_id
     
     if not code:
-        return jsonify({"error": "Missing code in callback"}), 400
+        return json_response({"error": "Missing code in callback"}), 400
 
     # Redirect to frontend home page with the code - frontend will handle the connection
     frontend_url = os.getenv("FRONTEND_URL", "http://localhost:3000")
@@ -249,7 +512,7 @@ def google_callback():
         }
         
         try:
-            response = requests.post(token_url, data=payload, headers={"Content-Type": "application/x-www-form-urlencoded"})
+            response = google_session.post(token_url, data=payload, headers={"Content-Type": "application/x-www-form-urlencoded"})
             
             if response.status_code != 200:
                 try:
@@ -274,7 +537,7 @@ def google_callback():
                 return redirect(f"{frontend_url}/login?error=no_access_token")
 
             # Fetch Google user profile using access token
-            user_info_response = requests.get(
+            user_info_response = google_session.get(
                 "https://www.googleapis.com/oauth2/v2/userinfo",
                 headers={"Authorization": f"Bearer {access_token}"}
             )
@@ -351,11 +614,14 @@ def google_callback():
                             user.google_access_token = access_token
                             if refresh_token:
                                 user.google_refresh_token = refresh_token
+                            invalidate_user_cache(user.id)
                             db.session.commit()
                         else:
                             raise db_error
                     else:
                         raise db_error
+            elif user.is_deleting:
+                return redirect(f"{frontend_url}/login?error=account_deleted")
             else:
                 # User exists - update profile picture and Google credentials
                 try:
@@ -371,6 +637,7 @@ def google_callback():
                     user.google_access_token = access_token
                     if refresh_token:
                         user.google_refresh_token = refresh_token
+                    invalidate_user_cache(user.id)
                     db.session.commit()
                     print(f"✅ Logged in existing user with Google: {google_email}")
                 except Exception as db_error:
@@ -384,9 +651,7 @@ def google_callback():
             # Redirect to homepage with token so user lands on home (Spotify can be linked there)
             return redirect(f"{frontend_url}/home?google_token={token}")
         except Exception as e:
-            print(f"❌ Error in Google login/signup callback: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in Google login/signup callback")
             error_message = str(e)
             return redirect(f"{frontend_url}/login?error=server_error&details={urllib.parse.quote(error_message)}")
     else:
@@ -404,16 +669,16 @@ def spotify_callback_complete():
         code = data.get("code")
         
         if not code:
-            return jsonify({"error": "Missing code"}), 400
+            return json_response({"error": "Missing code"}), 400
 
         # Validate user exists
         user = User.query.get(int(user_id))
         if not user:
-            return jsonify({"error": "User not found"}), 404
+            return json_response({"error": "User not found"}), 404
 
         # Check if Spotify credentials are configured
         if not app.config.get("SPOTIFY_CLIENT_ID") or not app.config.get("SPOTIFY_CLIENT_SECRET"):
-            return jsonify({"error": "Spotify credentials not configured"}), 500
+            return json_response({"error": "Spotify credentials not configured"}), 500
 
         token_url = "https://accounts.spotify.com/api/token"
         payload = {
@@ -424,12 +689,12 @@ def spotify_callback_complete():
             "client_secret": app.config["SPOTIFY_CLIENT_SECRET"]
         }
         
-        response = requests.post(token_url, data=payload, headers={"Content-Type": "application/x-www-form-urlencoded"})
+        response = spotify_session.post(token_url, data=payload, headers={"Content-Type": "application/x-www-form-urlencoded"})
         
         if response.status_code != 200:
             error_data = response.json() if response.text else {}
             print(f"Spotify token error: {response.status_code} - {error_data}")
-            return jsonify({
+            return json_response({
                 "error": "Failed to get access token from Spotify",
                 "details": error_data
             }), 400
@@ -439,13 +704,13 @@ def spotify_callback_complete():
         refresh_token = token_data.get("refresh_token")
 
         if not access_token:
-            return jsonify({
+            return json_response({
                 "error": "Failed to get access token",
                 "details": token_data
             }), 400
 
         # Fetch Spotify user profile
-        user_info_response = requests.get(
+        user_info_response = spotify_session.get(
             "https://api.spotify.com/v1/me",
             headers={"Authorization": f"Bearer {access_token}"}
         )
@@ -453,7 +718,7 @@ def spotify_callback_complete():
         if user_info_response.status_code != 200:
             error_data = user_info_response.json() if user_info_response.text else {}
             print(f"Spotify user info error: {user_info_response.status_code} - {error_data}")
-            return jsonify({
+            return json_response({
                 "error": "Failed to fetch Spotify user profile",
                 "details": error_data
             }), 400
@@ -466,24 +731,26 @@ def spotify_callback_complete():
             user.spotify_display_name = user_info.get("display_name")
             user.spotify_email = user_info.get("email")
             user.spotify_access_token = access_token
+            user.spotify_token_expires_at = spotify_token_expiry(token_data)
             if refresh_token:
                 user.spotify_refresh_token = refresh_token
             
+            invalidate_user_cache(user.id)
             db.session.commit()
         except Exception as db_error:
             db.session.rollback()
             print(f"Database error: {str(db_error)}")
             # Check if it's a unique constraint violation
             if "UNIQUE constraint" in str(db_error) or "unique" in str(db_error).lower():
-                return jsonify({
+                return json_response({
                     "error": "Spotify account is already linked to another user"
                 }), 409
-            return jsonify({
+            return json_response({
                 "error": "Failed to save Spotify information",
                 "details": str(db_error)
             }), 500
 
-        return jsonify({
+        return json_response({
             "message": "Spotify account linked successfully",
             "spotify_user": {
                 "id": user.spotify_id,
@@ -493,10 +760,8 @@ def spotify_callback_complete():
         }), 200
 
     except Exception as e:
-        print(f"Unexpected error in spotify_callback_complete: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({
+        logger.exception("Unexpected error in spotify_callback_complete")
+        return json_response({
             "error": "Internal server error",
             "details": str(e)
         }), 500
@@ -510,7 +775,7 @@ def refresh_spotify_token():
     user = User.query.get(user_id)
     refresh_token = getattr(user, "spotify_refresh_token", None)
     if not refresh_token:
-        return jsonify({"error": "No refresh token found"}), 400
+        return json_response({"error": "No refresh token found"}), 400
 
     token_url = "https://accounts.spotify.com/api/token"
     payload = {
@@ -519,16 +784,17 @@ def refresh_spotify_token():
         "client_id": app.config["SPOTIFY_CLIENT_ID"],
         "client_secret": app.config["SPOTIFY_CLIENT_SECRET"]
     }
-    response = requests.post(token_url, data=payload, headers={"Content-Type": "application/x-www-form-urlencoded"})
+    response = spotify_session.post(token_url, data=payload, headers={"Content-Type": "application/x-www-form-urlencoded"})
     token_data = response.json()
 
     new_access_token = token_data.get("access_token")
     if not new_access_token:
-        return jsonify({"error": "Failed to refresh token"}), 400
+        return json_response({"error": "Failed to refresh token"}), 400
 
     user.spotify_access_token = new_access_token
+    user.spotify_token_expires_at = spotify_token_expiry(token_data)
     db.session.commit()
-    return jsonify({"message": "Spotify token refreshed successfully"}), 200
+    return json_response({"message": "Spotify token refreshed successfully"}), 200
 
 
 # ======================================================
@@ -542,12 +808,16 @@ def log_emotion_post():
     data = request.get_json()
     emotion = data.get("emotion")
     if not emotion:
-        return jsonify({"error": "Emotion field required"}), 400
+        return json_response({"error": "Emotion field required"}), 400
 
     db.session.add(EmotionLog(user_id=user_id, emotion=emotion))
+    User.query.filter_by(id=user_id).update({
+        "latest_emotion": emotion,
+        "latest_emotion_at": datetime.datetime.utcnow()
+    })
     db.session.commit()
 
-    return jsonify({"message": f"Logged emotion: {emotion}"}), 200
+    return json_response({"message": f"Logged emotion: {emotion}"}), 200
 
 
 @app.route('/api/detect-emotion', methods=['POST'])
@@ -555,31 +825,28 @@ def log_emotion_post():
 def detect_emotion_from_image():
     """Detect emotion from base64 encoded image"""
     if not FER_AVAILABLE:
-        return jsonify({"error": "Emotion detection service not available. FER library not installed."}), 503
+        return json_response({"error": "Emotion detection service not available. FER library not installed."}), 503
     
     try:
         data = request.get_json()
         image_data = data.get("image")
         
         if not image_data:
-            return jsonify({"error": "Image data required"}), 400
+            return json_response({"error": "Image data required"}), 400
         
         # Remove data URL prefix if present (e.g., "data:image/jpeg;base64,...")
         if ',' in image_data:
-            image_data = image_data.split(',')[1]
+            image_data = image_data.split(',', 1)[1]
         
-        # Decode base64 image
-        image_bytes = base64.b64decode(image_data)
-        image = Image.open(BytesIO(image_bytes))
+        # Reject oversized uploads before decoding (base64 expands 3 bytes into 4 chars)
+        if (len(image_data) * 3) // 4 > app.config["MAX_IMAGE_UPLOAD_BYTES"]:
+            return json_response({"error": "Image too large"}), 413
         
-        # Convert PIL Image to numpy array (RGB)
-        image_array = np.array(image)
-        
-        # Convert RGB to BGR for OpenCV/FER
-        if len(image_array.shape) == 3 and image_array.shape[2] == 3:
-            image_bgr = image_array[:, :, ::-1]  # RGB to BGR
-        else:
-            image_bgr = image_array
+        # Decode base64 image straight into a BGR array for OpenCV/FER
+        image_buffer = np.frombuffer(b64decode(image_data, validate=False), dtype=np.uint8)
+        image_bgr = cv2.imdecode(image_buffer, cv2.IMREAD_COLOR)
+        if image_bgr is None:
+            return json_response({"error": "Invalid image data"}), 400
         
         # Detect emotions
         global fer_detector
@@ -597,28 +864,32 @@ def detect_emotion_from_image():
              emotions = []
         
         if not emotions or len(emotions) == 0:
-            return jsonify({
+            return json_response({
                 "emotion": None,
                 "confidence": 0,
                 "message": "No face detected in the image"
             }), 200
         
-        # Get the first face's top emotion
-        face = emotions[0]
-        emotion_scores = face.get("emotions", {})
+        faces = [face for face in emotions if face.get("emotions")]
         
-        if not emotion_scores:
-            return jsonify({
+        if not faces:
+            return json_response({
                 "emotion": None,
                 "confidence": 0,
                 "message": "Could not detect emotions"
             }), 200
         
-        # Find the emotion with highest score
-        top_emotion = max(emotion_scores, key=emotion_scores.get)
-        confidence = emotion_scores[top_emotion]
+        # Pick the dominant face-emotion pair across all detected faces
+        scores = np.array(
+            [[face["emotions"].get(label, 0.0) for label in FER_LABELS] for face in faces],
+            dtype=np.float32
+        )
+        face_index, label_index, _ = top_face_emotion(scores)
+        emotion_scores = faces[face_index]["emotions"]
+        top_emotion = FER_LABELS[label_index]
+        confidence = emotion_scores.get(top_emotion, 0)
         
-        return jsonify({
+        return json_response({
             "emotion": top_emotion,
             "confidence": round(confidence, 2),
             "all_emotions": emotion_scores
@@ -626,7 +897,7 @@ def detect_emotion_from_image():
         
     except Exception as e:
         print(f"Error detecting emotion: {str(e)}")
-        return jsonify({"error": f"Failed to detect emotion: {str(e)}"}), 500
+        return json_response({"error": f"Failed to detect emotion: {str(e)}"}), 500
 
 
 @app.route('/api/recommendations', methods=['GET'])
@@ -640,16 +911,19 @@ def get_recommendations():
     language = request.args.get("language")
     wellbeing_mode = request.args.get("wellbeing", "false").lower() == "true"
 
+    if not emotion and user:
+        emotion = user.latest_emotion
+        if not emotion:
+            # Accounts that logged emotions before latest_emotion existed
+            last_log = EmotionLog.query.filter_by(user_id=user_id).order_by(EmotionLog.timestamp.desc()).first()
+            emotion = last_log.emotion if last_log else None
     if not emotion:
-        last_log = EmotionLog.query.filter_by(user_id=user_id).order_by(EmotionLog.timestamp.desc()).first()
-        if not last_log:
-            return jsonify({"error": "No emotion detected yet"}), 404
-        emotion = last_log.emotion
+        return json_response({"error": "No emotion detected yet"}), 404
 
     if not language:
-        return jsonify({
+        return json_response({
             "message": "Please select a language to continue.",
-            "available_languages": ["Hindi", "English", "Bengali", "Marathi", "Telugu", "Tamil", "Global"]
+            "available_languages": AVAILABLE_LANGUAGES
         }), 200
 
     # 🌿 Mental well-being mapping
@@ -663,21 +937,21 @@ def get_recommendations():
     }
     query_emotion = MENTAL_WELLBEING_MAP.get(emotion.lower(), emotion) if wellbeing_mode else emotion
     
-    # For Global, search without language restriction
-    if language == "Global":
-        query = query_emotion
-    else:
-        query = f"{query_emotion} {language}"
+    # Quoted "<emotion> <language>" (Global has an empty suffix, i.e. no language restriction)
+    lang_suffix = QUOTED_LANG_SUFFIX.get(language)
+    if lang_suffix is None:
+        lang_suffix = urllib.parse.quote(" " + language)
+    quoted_query = quote_emotion(query_emotion) + lang_suffix
 
     # ✅ Spotify path - only return Spotify data, no fallbacks when linked
     if user and user.spotify_access_token:
         ensure_valid_spotify_token(user)
-        spotify_resp = requests.get(
-            f"https://api.spotify.com/v1/search?q={urllib.parse.quote(query)}&type=track&limit=15",
+        spotify_resp = spotify_session.get(
+            SPOTIFY_SEARCH_URL % (quoted_query, "track", 15),
             headers={"Authorization": f"Bearer {user.spotify_access_token}"}
         )
         if spotify_resp.status_code == 200:
-            tracks = spotify_resp.json().get("tracks", {}).get("items", [])
+            tracks = spotify_json(spotify_resp).get("tracks", {}).get("items", [])
             results = []
             seen_track_ids = set()
             
@@ -689,14 +963,13 @@ def get_recommendations():
                 seen_track_ids.add(track_id)
                 
                 album = t.get("album", {})
-                images = album.get("images", [])
                 # Get the medium-sized image (index 1) or largest (index 0) if available
-                image_url = images[1].get("url") if len(images) > 1 else (images[0].get("url") if len(images) > 0 else None)
+                image_url = pick_image(album.get("images", ()))
                 
                 results.append({
                     "id": track_id,
                     "title": t.get("name"),
-                    "artist": ", ".join([a["name"] for a in t.get("artists", [])]),
+                    "artist": ", ".join(a["name"] for a in t.get("artists", ())),
                     "album": album.get("name"),
                     "spotifyUri": t.get("uri"),
                     "imageUrl": image_url,
@@ -706,12 +979,12 @@ def get_recommendations():
                     "wellbeing_mode": wellbeing_mode
                 })
             # Return only 15 items max
-            return jsonify(results[:15]), 200
+            return json_response(results[:15]), 200
         # If Spotify request fails, return empty array (no fallback when Spotify is linked)
-        return jsonify([]), 200
+        return json_response([]), 200
 
     # No fallback when Spotify is not linked - return empty array
-    return jsonify([]), 200
+    return json_response([]), 200
 
 
 @app.route('/api/search', methods=['GET'])
@@ -724,37 +997,36 @@ def search_music():
     search_type = request.args.get("type", "track")
 
     if not query:
-        return jsonify({"error": "Missing search query"}), 400
+        return json_response({"error": "Missing search query"}), 400
 
     # Spotify path
     if user and user.spotify_access_token:
         ensure_valid_spotify_token(user)
-        resp = requests.get(
+        resp = spotify_session.get(
             f"https://api.spotify.com/v1/search?q={urllib.parse.quote(query)}&type={search_type}&limit=10",
             headers={"Authorization": f"Bearer {user.spotify_access_token}"}
         )
         if resp.status_code == 200:
-            data = resp.json()
+            data = spotify_json(resp)
             results = []
             for t in data.get("tracks", {}).get("items", []):
                 album = t.get("album", {})
-                images = album.get("images", [])
                 # Get the medium-sized image (index 1) or largest (index 0) if available
-                image_url = images[1].get("url") if len(images) > 1 else (images[0].get("url") if len(images) > 0 else None)
+                image_url = pick_image(album.get("images", ()))
                 
                 results.append({
                     "id": t.get("id"),
                     "title": t.get("name"),
-                    "artist": ", ".join([a["name"] for a in t.get("artists", [])]),
+                    "artist": ", ".join(a["name"] for a in t.get("artists", ())),
                     "album": album.get("name"),
                     "spotifyUri": t.get("uri"),
                     "imageUrl": image_url,
                     "source": "Spotify"
                 })
-            return jsonify(results), 200
+            return json_response(results), 200
 
     # No fallback when Spotify is not linked - return empty array
-    return jsonify([]), 200
+    return json_response([]), 200
 
 # =========================================
 # Liked / Unliked songs & history endpoints
@@ -782,12 +1054,12 @@ def like_song():
     album = data.get("album")
 
     if not source or not external_id or not title:
-        return jsonify({"error": "source, external_id and title are required"}), 400
+        return json_response({"error": "source, external_id and title are required"}), 400
 
     # Check duplicate via unique constraint
     existing = LikedSong.query.filter_by(user_id=user_id, source=source, external_id=external_id).first()
     if existing:
-        return jsonify({"message": "Song already liked"}), 200
+        return json_response({"message": "Song already liked"}), 200
 
     liked = LikedSong(
         user_id=user_id,
@@ -799,7 +1071,7 @@ def like_song():
     )
     db.session.add(liked)
     db.session.commit()
-    return jsonify({"message": "Song liked successfully"}), 201
+    return json_response({"message": "Song liked successfully"}), 201
 
 @app.route('/api/songs/like', methods=['DELETE'])
 @jwt_required()
@@ -816,15 +1088,15 @@ def unlike_song():
     source = data.get("source")
     external_id = data.get("external_id")
     if not source or not external_id:
-        return jsonify({"error": "source and external_id are required"}), 400
+        return json_response({"error": "source and external_id are required"}), 400
 
     existing = LikedSong.query.filter_by(user_id=user_id, source=source, external_id=external_id).first()
     if not existing:
-        return jsonify({"error": "Song not found in liked songs"}), 404
+        return json_response({"error": "Song not found in liked songs"}), 404
 
     db.session.delete(existing)
     db.session.commit()
-    return jsonify({"message": "Song unliked successfully"}), 200
+    return json_response({"message": "Song unliked successfully"}), 200
 
 @app.route('/api/liked-songs', methods=['GET'])
 @jwt_required()
@@ -840,7 +1112,7 @@ def get_liked_songs():
             "album": s.album
         } for s in liked
     ]
-    return jsonify(results), 200
+    return json_response(results), 200
 
 @app.route('/api/song-history', methods=['GET'])
 @jwt_required()
@@ -856,7 +1128,7 @@ def get_song_history():
             "album": h.album
         } for h in history
     ]
-    return jsonify(results), 200
+    return json_response(results), 200
 
 
 # ======================================================
@@ -866,17 +1138,216 @@ def get_song_history():
 @jwt_required()
 def get_all_playlists():
     user_id = get_jwt_identity()
-    playlists = Playlist.query.filter_by(user_id=user_id).all()
-    return jsonify([
-        {"playlistId": p.id, "name": p.name, "description": p.description, "createdAt": p.created_at.isoformat()}
-        for p in playlists
+    # Select plain columns so no ORM objects are built just to be serialized
+    rows = db.session.query(
+        Playlist.id, Playlist.name, Playlist.description, Playlist.created_at
+    ).filter_by(user_id=user_id).all()
+    return json_response([
+        {"playlistId": playlist_id, "name": name, "description": description, "createdAt": created_at.isoformat()}
+        for playlist_id, name, description, created_at in rows
     ]), 200
 
 
+def quote_search_queries(queries_by_language):
+    """URL-encode a query table once at import; "*" templates keep their {} placeholder"""
+    return {
+        language: tuple(urllib.parse.quote(query, safe="{}" if language == "*" else "/") for query in queries)
+        for language, queries in queries_by_language.items()
+    }
+
+
+# Per-language search queries for the public endpoints; "*" holds templates for any other language (stored URL-encoded)
+PUBLIC_TRENDING_QUERIES = quote_search_queries({
+    "Global": ("top hits", "popular songs", "trending", "chart hits", "viral"),
+    "Hindi": ("bollywood hits", "hindi top", "hindi popular", "bollywood chart", "hindi trending"),
+    "English": ("top songs", "pop hits", "popular music", "chart top", "trending songs"),
+    "*": ("{} hits", "{} top", "{} popular")
+})
+PUBLIC_INDUSTRY_QUERIES = quote_search_queries({
+    "Global": ("chart hits", "viral songs", "trending now", "popular music", "top charts", "new releases", "latest hits"),
+    "Hindi": ("hindi chart", "bollywood chart", "indian hits", "hindi trending", "bollywood viral", "latest hindi", "new bollywood"),
+    "English": ("chart top", "viral hits", "trending music", "popular chart", "top music", "new releases", "latest songs"),
+    "*": ("{} chart", "{} viral", "{} trending", "latest {}", "new {}")
+})
+PUBLIC_ARTIST_QUERIES = quote_search_queries({
+    "Global": ("top artist", "popular artist", "trending artist", "famous artist", "best artist"),
+    "Hindi": ("bollywood top artist", "hindi singer", "bollywood singer", "hindi artist", "indian singer"),
+    "English": ("top artist", "popular singer", "famous artist", "best singer", "trending artist"),
+    "*": ("{} artist", "{} singer", "{} top artist")
+})
+
+# Spotify IDs of well-known artists, so they can be fetched in one /v1/artists call instead of searched by name
+ARTIST_ID_BY_NAME = {
+    "Ed Sheeran": "6eUKZXaKkcviH0Ku9w2n3V",
+    "Taylor Swift": "06HL4z0CvFAxyc27GXpf02",
+    "The Weeknd": "1Xyo4u8uXC1ZmMpatF05PJ",
+    "Drake": "3TVXtAsR1Inumwj472S9r4",
+    "Adele": "4dpARuHxo51G3z768sgnrY",
+    "Billie Eilish": "6qqNVTkY8uBg9cP3Jd7DAH",
+    "Post Malone": "246dkjvS1zLTtiykXe5h60",
+    "Dua Lipa": "6M2wZ9GZgrQXHCFfjv46we",
+    "Justin Bieber": "1uNFoZAHBGtllmzznpCI3s",
+    "Ariana Grande": "66CXWjxzNUsdJxJ2JdwvnR",
+    "Bruno Mars": "0du5cEVh5yTK9QJze8zA0C",
+    "Coldplay": "4gzpq5DPGxSnKTe4SA8HAU",
+    "Imagine Dragons": "53XhwfbYqKCa1cC15pYq2q",
+    "Eminem": "7dGJo4pcD2V6oG8kP0tJRR",
+    "Kanye West": "5K4W6rqBFWDnAN6FQUkS6x",
+    "Kendrick Lamar": "2YZyLoL8N0Wb9xBt1NhZWg",
+    "Lana Del Rey": "00FQb4jTyendYWaN8pK0wa",
+    "Rihanna": "5pKCCKE2ajJHZ9KAiaK11H",
+    "Beyoncé": "6vWDO969PvNqNYHIOW5v0m",
+    "The Beatles": "3WrFJ7ztbogyGnTHbHJFl2",
+    "Queen": "1dfeR4HaWDbWqFHLkxsg1d",
+    "BTS": "3Nrfpe0tUJi4K4DXYWgMUX",
+    "Bad Bunny": "4q3ewBCX7sLwd24euuV69X",
+    "Shakira": "0EmeFodog0BfCgMzAIvKQp",
+    "Arijit Singh": "4YRxDV8wJFPHPTeXepOstw",
+    "Shreya Ghoshal": "0oOet2f43PA68X5RxKobEy",
+    "A.R. Rahman": "1mYsTxnqsietFxj1OgoGbG",
+}
+
+# Artists looked up in one /v1/artists call by the public endpoint before falling back to search
+PUBLIC_CURATED_ARTIST_IDS = {
+    language: tuple(ARTIST_ID_BY_NAME[name] for name in names)
+    for language, names in {
+        "English": (
+            "Ed Sheeran", "Taylor Swift", "The Weeknd", "Drake", "Adele", "Billie Eilish",
+            "Post Malone", "Dua Lipa", "Justin Bieber", "Ariana Grande", "Bruno Mars",
+            "Coldplay", "Imagine Dragons", "Eminem", "Kendrick Lamar", "Rihanna"
+        ),
+        "Hindi": ("Arijit Singh", "Shreya Ghoshal", "A.R. Rahman"),
+        "Global": (
+            "Ed Sheeran", "Taylor Swift", "The Weeknd", "Drake", "Billie Eilish", "Dua Lipa",
+            "Arijit Singh", "A.R. Rahman", "BTS", "Bad Bunny", "Shakira", "Coldplay"
+        ),
+    }.items()
+}
+
+
+# Artists searched by /api/artists, per language (duplicates dropped once here rather than per request)
+POPULAR_ARTISTS_BY_LANGUAGE = {
+    language: tuple(dict.fromkeys(names))
+    for language, names in {
+        "Global": (
+            "Ed Sheeran", "Taylor Swift", "The Weeknd", "Drake", "Adele",
+            "Billie Eilish", "Post Malone", "Dua Lipa", "Justin Bieber",
+            "Ariana Grande", "Bruno Mars", "Coldplay", "Imagine Dragons",
+            "Arijit Singh", "Shreya Ghoshal", "A.R. Rahman",
+            "BTS", "Bad Bunny", "J Balvin", "Shakira", "Eminem",
+            "Kanye West", "Kendrick Lamar", "Lana Del Rey", "Rihanna",
+            "Beyoncé", "The Beatles", "Queen"
+        ),
+        "Hindi": (
+            "Arijit Singh", "Sonu Nigam", "Shreya Ghoshal", "Atif Aslam",
+            "Kumar Sanu", "Udit Narayan", "Alka Yagnik", "Kishore Kumar",
+            "Lata Mangeshkar", "Mohammed Rafi", "A.R. Rahman", "Vishal-Shekhar"
+        ),
+        "Bengali": (
+            "Anupam Roy", "Rupam Islam", "Nachiketa", "Srikanto Acharya",
+            "Lopamudra Mitra", "Shreya Ghoshal", "Arijit Singh"
+        ),
+        "Marathi": (
+            "Ajay-Atul", "Shankar Mahadevan", "Sonu Nigam", "Shreya Ghoshal"
+        ),
+        "Telugu": (
+            "S.P. Balasubrahmanyam", "K.S. Chithra", "Sid Sriram", "Anirudh Ravichander"
+        ),
+        "Tamil": (
+            "A.R. Rahman", "Ilaiyaraaja", "Anirudh Ravichander", "Yuvan Shankar Raja",
+            "Sid Sriram", "Shreya Ghoshal"
+        ),
+        # Default English/International artists
+        "English": (
+            "Ed Sheeran", "Taylor Swift", "The Weeknd", "Drake", "Adele",
+            "Billie Eilish", "Post Malone", "Dua Lipa", "Justin Bieber",
+            "Ariana Grande", "Bruno Mars", "Coldplay", "Imagine Dragons",
+            "Eminem", "Kanye West", "Kendrick Lamar", "Lana Del Rey",
+            "Rihanna", "Beyoncé", "The Beatles", "Queen"
+        ),
+    }.items()
+}
+DEFAULT_POPULAR_ARTISTS = POPULAR_ARTISTS_BY_LANGUAGE["English"]
+# Search URLs for the popular artists, built once instead of URL-encoding names per lookup
+ARTIST_SEARCH_URLS = {
+    name: SPOTIFY_SEARCH_URL % (urllib.parse.quote(name), "artist", 1)
+    for names in POPULAR_ARTISTS_BY_LANGUAGE.values()
+    for name in names
+}
+
+# Track search used by /api/trending-songs for languages other than Global/English (default: the language name), URL-encoded
+TRENDING_LANGUAGE_QUERIES = {
+    language: urllib.parse.quote(query)
+    for language, query in {
+        "Hindi": "hindi bollywood",
+        "Bengali": "bengali",
+        "Marathi": "marathi",
+        "Telugu": "telugu",
+        "Tamil": "tamil"
+    }.items()
+}
+
+# Industry-focused searches for linked users; "*" holds templates for any other language (stored URL-encoded)
+INDUSTRY_QUERIES_BY_LANGUAGE = quote_search_queries({
+    "Global": ("chart hits", "viral songs", "trending now", "popular music", "top charts", "new releases", "latest hits", "billboard top", "music charts"),
+    "Hindi": ("hindi chart", "bollywood chart", "indian hits", "hindi trending", "bollywood viral", "latest hindi", "new bollywood", "indian top songs"),
+    "English": ("chart top", "viral hits", "trending music", "popular chart", "top music", "new releases", "latest songs", "billboard hot", "top charts"),
+    "Bengali": ("bengali chart", "bengali viral", "bengali trending", "latest bengali", "new bengali"),
+    "Marathi": ("marathi chart", "marathi viral", "marathi trending", "latest marathi", "new marathi"),
+    "Telugu": ("telugu chart", "telugu viral", "telugu trending", "latest telugu", "new telugu"),
+    "Tamil": ("tamil chart", "tamil viral", "tamil trending", "latest tamil", "new tamil"),
+    "*": ("{} chart", "{} viral", "{} trending", "latest {}", "new {}")
+})
+
+
+# Upper bound on client-supplied exclude_ids so the seen set stays small
+MAX_EXCLUDE_IDS = 100
+
+
+def parse_exclude_ids(exclude_ids_param):
+    """Set of up to MAX_EXCLUDE_IDS non-empty IDs from a comma-separated query parameter"""
+    if not exclude_ids_param:
+        return set()
+    return set(filter(None, exclude_ids_param.split(",", MAX_EXCLUDE_IDS)[:MAX_EXCLUDE_IDS]))
+
+
+def language_search_queries(queries_by_language, language):
+    """URL-encoded search queries for language, filling the "*" templates when it has no dedicated list"""
+    queries = queries_by_language.get(language) if language != "*" else None
+    if queries is None:
+        quoted_language = urllib.parse.quote(language)
+        queries = tuple(template.format(quoted_language) for template in queries_by_language["*"])
+    return queries
+
+
+class LanguageConfig(NamedTuple):
+    """Per-language Spotify lookups shared by the trending, industry and artists endpoints"""
+    trending_query: str  # URL-encoded track search used by trending-songs outside Global/English
+    industry_queries: tuple  # URL-encoded industry searches for linked users
+    public_industry_queries: tuple  # URL-encoded industry searches for the client-credentials path
+    artists: tuple  # popular artist names
+
+
+@functools.lru_cache(maxsize=64)
+def language_config(language):
+    """Resolve every per-language table for language once (languages repeat, so results are cached)"""
+    return LanguageConfig(
+        trending_query=TRENDING_LANGUAGE_QUERIES.get(language) or urllib.parse.quote(language.lower()),
+        industry_queries=language_search_queries(INDUSTRY_QUERIES_BY_LANGUAGE, language),
+        public_industry_queries=language_search_queries(PUBLIC_INDUSTRY_QUERIES, language),
+        artists=POPULAR_ARTISTS_BY_LANGUAGE.get(language, DEFAULT_POPULAR_ARTISTS)
+    )
+
+
 @app.route('/api/public/trending-songs', methods=['GET'])
 def get_public_trending_songs():
     """Get trending/popular songs without authentication - ALWAYS returns exactly 10 items"""
     language = request.args.get("language", "English")
+    cache_key = f"pub:trending:{language}"
+    cached, stale = cached_response(cache_key)
+    if cached is not None:
+        return cached, 200
+    
     all_tracks = []
     seen_track_ids = set()
     
@@ -885,59 +1356,26 @@ def get_public_trending_songs():
     
     # Strategy 1: Try multiple popular search queries (fastest and most reliable)
     if spotify_token:
-        search_queries = []
-        if language == "Global":
-            search_queries = ["top hits", "popular songs", "trending", "chart hits", "viral"]
-        elif language == "Hindi":
-            search_queries = ["bollywood hits", "hindi top", "hindi popular", "bollywood chart", "hindi trending"]
-        elif language == "English":
-            search_queries = ["top songs", "pop hits", "popular music", "chart top", "trending songs"]
-        else:
-            search_queries = [f"{language} hits", f"{language} top", f"{language} popular"]
+        search_queries = language_search_queries(PUBLIC_TRENDING_QUERIES, language)
         
-        for query in search_queries:
+        urls = [SPOTIFY_SEARCH_URL % (query, "track", 10) for query in search_queries]
+        # Each query can contribute at most 10 tracks, so stop parsing its response after that
+        for tracks in spotify_get_items_many(urls, spotify_token, "tracks.items", 10):
             if len(all_tracks) >= 10:
                 break
-            try:
-                spotify_resp = requests.get(
-                    f"https://api.spotify.com/v1/search?q={urllib.parse.quote(query)}&type=track&limit=20",
-                    headers={"Authorization": f"Bearer {spotify_token}"},
-                    timeout=3
-                )
-                if spotify_resp.status_code == 200:
-                    tracks = spotify_resp.json().get("tracks", {}).get("items", [])
-                    for track in tracks:
-                        if len(all_tracks) >= 10:
-                            break
-                        track_id = track.get("id")
-                        if not track_id or track_id in seen_track_ids:
-                            continue
-                        seen_track_ids.add(track_id)
-                        
-                        album = track.get("album", {})
-                        images = album.get("images", [])
-                        image_url = images[1].get("url") if len(images) > 1 else (images[0].get("url") if images else "/images/song-1.png")
-                        artists = track.get("artists", [])
-                        artist_name = ", ".join([a.get("name") for a in artists]) if artists else "Unknown"
-                        
-                        all_tracks.append({
-                            "id": track_id,
-                            "title": track.get("name"),
-                            "subtitle": artist_name,
-                            "imageUrl": image_url,
-                            "album": album.get("name"),
-                            "artist": artist_name,
-                            "spotifyId": track_id,
-                            "spotifyUri": track.get("uri"),
-                            "spotifyUrl": f"https://open.spotify.com/track/{track_id}",
-                            "source": "Spotify"
-                        })
-            except Exception as e:
-                print(f"Error with search query '{query}': {e}")
+            if not tracks:
                 continue
+            for track in tracks:
+                if len(all_tracks) >= 10:
+                    break
+                track_id = track.get("id")
+                if not track_id or track_id in seen_track_ids:
+                    continue
+                seen_track_ids.add(track_id)
+                all_tracks.append(public_track_item(track_id, track))
     
     # Spotify-only: no JioSaavn or static defaults.
-    return jsonify(all_tracks[:10]), 200
+    return cache_response(cache_key, all_tracks[:10], stale=stale), 200
 
 
 @app.route('/api/public/industry-songs', methods=['GET'])
@@ -945,76 +1383,52 @@ def get_public_industry_songs():
     """Get industry/popular songs for Industry section - ALWAYS returns exactly 10 items, different from trending"""
     language = request.args.get("language", "English")
     # Get exclude IDs from query parameter (comma-separated list of trending song IDs)
-    exclude_ids_param = request.args.get("exclude_ids", "")
-    exclude_ids = set(exclude_ids_param.split(",")) if exclude_ids_param else set()
+    exclude_ids = parse_exclude_ids(request.args.get("exclude_ids", ""))
+    exclude_hash = hashlib.sha1(",".join(sorted(exclude_ids)).encode()).hexdigest()
+    cache_key = f"pub:industry:{language}:{exclude_hash}"
+    cached, stale = cached_response(cache_key)
+    if cached is not None:
+        return cached, 200
     
     all_tracks = []
-    seen_track_ids = set(exclude_ids)  # Start with excluded IDs to avoid duplicates
+    seen_track_ids = exclude_ids  # Start with excluded IDs to avoid duplicates
     
     # Get Spotify client credentials token
     spotify_token = get_spotify_token()
     
     # Strategy 1: Use different search queries than trending songs (industry-focused)
     if spotify_token:
-        search_queries = []
-        if language == "Global":
-            search_queries = ["chart hits", "viral songs", "trending now", "popular music", "top charts", "new releases", "latest hits"]
-        elif language == "Hindi":
-            search_queries = ["hindi chart", "bollywood chart", "indian hits", "hindi trending", "bollywood viral", "latest hindi", "new bollywood"]
-        elif language == "English":
-            search_queries = ["chart top", "viral hits", "trending music", "popular chart", "top music", "new releases", "latest songs"]
-        else:
-            search_queries = [f"{language} chart", f"{language} viral", f"{language} trending", f"latest {language}", f"new {language}"]
+        search_queries = language_search_queries(PUBLIC_INDUSTRY_QUERIES, language)
         
-        for query in search_queries:
+        urls = [SPOTIFY_SEARCH_URL % (query, "track", 10) for query in search_queries]
+        # Each query can contribute at most 10 tracks, so stop parsing its response after that
+        for tracks in spotify_get_items_many(urls, spotify_token, "tracks.items", 10):
             if len(all_tracks) >= 10:
                 break
-            try:
-                spotify_resp = requests.get(
-                    f"https://api.spotify.com/v1/search?q={urllib.parse.quote(query)}&type=track&limit=20",
-                    headers={"Authorization": f"Bearer {spotify_token}"},
-                    timeout=3
-                )
-                if spotify_resp.status_code == 200:
-                    tracks = spotify_resp.json().get("tracks", {}).get("items", [])
-                    for track in tracks:
-                        if len(all_tracks) >= 10:
-                            break
-                        track_id = track.get("id")
-                        if not track_id or track_id in seen_track_ids:
-                            continue
-                        seen_track_ids.add(track_id)
-                        
-                        album = track.get("album", {})
-                        images = album.get("images", [])
-                        image_url = images[1].get("url") if len(images) > 1 else (images[0].get("url") if images else "/images/song-1.png")
-                        artists = track.get("artists", [])
-                        artist_name = ", ".join([a.get("name") for a in artists]) if artists else "Unknown"
-                        
-                        all_tracks.append({
-                            "id": track_id,
-                            "title": track.get("name"),
-                            "subtitle": artist_name,
-                            "imageUrl": image_url,
-                            "album": album.get("name"),
-                            "artist": artist_name,
-                            "spotifyId": track_id,
-                            "spotifyUri": track.get("uri"),
-                            "spotifyUrl": f"https://open.spotify.com/track/{track_id}",
-                            "source": "Spotify"
-                        })
-            except Exception as e:
-                print(f"Error with industry search query '{query}': {e}")
+            if not tracks:
                 continue
+            for track in tracks:
+                if len(all_tracks) >= 10:
+                    break
+                track_id = track.get("id")
+                if not track_id or track_id in seen_track_ids:
+                    continue
+                seen_track_ids.add(track_id)
+                all_tracks.append(public_track_item(track_id, track))
     
     # Spotify-only: no JioSaavn or static defaults.
-    return jsonify(all_tracks[:10]), 200
+    return cache_response(cache_key, all_tracks[:10], stale=stale), 200
 
 
 @app.route('/api/public/featured-playlists', methods=['GET'])
 def get_public_featured_playlists():
     """Get featured playlists without authentication - ALWAYS returns exactly 2 items"""
     language = request.args.get("language", "English")
+    cache_key = f"pub:featured:{language}"
+    cached, stale = cached_response(cache_key)
+    if cached is not None:
+        return cached, 200
+    
     playlists_data = []
     seen_playlist_ids = set()
     
@@ -1023,13 +1437,9 @@ def get_public_featured_playlists():
     # Strategy 1: Get featured playlists directly (most reliable)
     if spotify_token:
         try:
-            featured_resp = requests.get(
-                "https://api.spotify.com/v1/browse/featured-playlists?limit=20",
-                headers={"Authorization": f"Bearer {spotify_token}"},
-                timeout=3
-            )
-            if featured_resp.status_code == 200:
-                featured = featured_resp.json().get("playlists", {}).get("items", [])
+            featured_data = spotify_get_conditional("https://api.spotify.com/v1/browse/featured-playlists?limit=20", spotify_token)
+            if featured_data:
+                featured = featured_data.get("playlists", {}).get("items", [])
                 for playlist in featured:
                     if len(playlists_data) >= 2:
                         break
@@ -1038,8 +1448,7 @@ def get_public_featured_playlists():
                         continue
                     seen_playlist_ids.add(playlist_id)
                     
-                    images = playlist.get("images", [])
-                    image_url = images[0].get("url") if images else "/images/playlist-1.png"
+                    image_url = pick_image(playlist.get("images") or (), "/images/playlist-1.png", 0)
                     description = playlist.get("description", "")
                     if description:
                         description = description[:60]
@@ -1056,7 +1465,7 @@ def get_public_featured_playlists():
                         "genre": "Featured"
                     })
         except Exception as e:
-            print(f"Error fetching featured playlists: {e}")
+            logger.warning("Error fetching featured playlists: %s", e)
     
     # Strategy 2: Search for popular playlists if featured didn't return enough
     if len(playlists_data) < 2 and spotify_token:
@@ -1072,13 +1481,13 @@ def get_public_featured_playlists():
             if len(playlists_data) >= 2:
                 break
             try:
-                search_resp = requests.get(
+                search_resp = spotify_session.get(
                     f"https://api.spotify.com/v1/search?q={urllib.parse.quote(query)}&type=playlist&limit=10",
                     headers={"Authorization": f"Bearer {spotify_token}"},
                     timeout=3
                 )
                 if search_resp.status_code == 200:
-                    playlists = search_resp.json().get("playlists", {}).get("items", [])
+                    playlists = spotify_json(search_resp).get("playlists", {}).get("items", [])
                     for playlist in playlists:
                         if len(playlists_data) >= 2:
                             break
@@ -1087,8 +1496,7 @@ def get_public_featured_playlists():
                             continue
                         seen_playlist_ids.add(playlist_id)
                         
-                        images = playlist.get("images", [])
-                        image_url = images[0].get("url") if images else "/images/playlist-1.png"
+                        image_url = pick_image(playlist.get("images") or (), "/images/playlist-1.png", 0)
                         tracks_total = playlist.get("tracks", {}).get("total", 0)
                         description = f"{tracks_total} tracks"
                         
@@ -1101,70 +1509,128 @@ def get_public_featured_playlists():
                             "genre": "Popular"
                         })
             except Exception as e:
-                print(f"Error searching for playlists with query '{query}': {e}")
+                logger.warning("Error searching for playlists with query '%s': %s", query, e)
                 continue
     
     # Spotify-only: no static defaults.
-    return jsonify(playlists_data[:2]), 200
+    return cache_response(cache_key, playlists_data[:2], stale=stale), 200
 
 
 @app.route('/api/public/artists', methods=['GET'])
 def get_public_artists():
     """Get popular artists without authentication - ALWAYS returns exactly 10 items"""
     language = request.args.get("language", "English")
+    cache_key = f"pub:artists:{language}"
+    cached, stale = cached_response(cache_key)
+    if cached is not None:
+        return cached, 200
+    
     artists_data = []
     seen_artist_ids = set()
     
     spotify_token = get_spotify_token()
     
-    # Strategy 1: Try multiple search queries to get popular artists
     if spotify_token:
-        search_queries = []
-        if language == "Global":
-            search_queries = ["top artist", "popular artist", "trending artist", "famous artist", "best artist"]
-        elif language == "Hindi":
-            search_queries = ["bollywood top artist", "hindi singer", "bollywood singer", "hindi artist", "indian singer"]
-        elif language == "English":
-            search_queries = ["top artist", "popular singer", "famous artist", "best singer", "trending artist"]
-        else:
-            search_queries = [f"{language} artist", f"{language} singer", f"{language} top artist"]
+        artist_batches = []
+        
+        # Strategy 1: One batched lookup of curated artists for the language
+        curated_ids = PUBLIC_CURATED_ARTIST_IDS.get(language)
+        if curated_ids:
+            data = spotify_get_async(SPOTIFY_ARTISTS_URL % ",".join(curated_ids[:50]), spotify_token).result()
+            # Unknown IDs come back as null entries
+            artist_batches.append([artist for artist in (data or {}).get("artists", []) if artist])
         
-        for query in search_queries:
+        # Strategy 2: Try multiple search queries to get popular artists
+        if sum(len(batch) for batch in artist_batches) < 10:
+            search_queries = language_search_queries(PUBLIC_ARTIST_QUERIES, language)
+            urls = [SPOTIFY_SEARCH_URL % (query, "artist", 10) for query in search_queries]
+            artist_batches.extend(
+                (data or {}).get("artists", {}).get("items", []) for data in spotify_get_many(urls, spotify_token)
+            )
+        
+        for artists in artist_batches:
             if len(artists_data) >= 10:
                 break
-            try:
-                search_resp = requests.get(
-                    f"https://api.spotify.com/v1/search?q={urllib.parse.quote(query)}&type=artist&limit=20",
-                    headers={"Authorization": f"Bearer {spotify_token}"},
-                    timeout=3
-                )
-                if search_resp.status_code == 200:
-                    artists = search_resp.json().get("artists", {}).get("items", [])
-                    # Sort by followers to get most popular
-                    artists_sorted = sorted(artists, key=lambda x: x.get('followers', {}).get('total', 0), reverse=True)
-                    for artist in artists_sorted:
-                        if len(artists_data) >= 10:
-                            break
-                        artist_id = artist.get("id")
-                        if not artist_id or artist_id in seen_artist_ids:
-                            continue
-                        seen_artist_ids.add(artist_id)
-                        
-                        images = artist.get("images", [])
-                        image_url = images[0].get("url") if images else f"/images/artist-{artist.get('name', '').lower().replace(' ', '-')}-circle.png"
-                        artists_data.append({
-                            "id": artist_id,
-                            "title": artist.get("name"),
-                            "subtitle": f"{artist.get('followers', {}).get('total', 0):,} followers",
-                            "imageUrl": image_url,
-                            "spotifyId": artist_id
-                        })
-            except Exception as e:
-                print(f"Error with artist search query '{query}': {e}")
-                continue
+            # Sort by followers to get most popular
+            artists_sorted = sorted(artists, key=lambda x: x.get('followers', {}).get('total', 0), reverse=True)
+            for artist in artists_sorted:
+                if len(artists_data) >= 10:
+                    break
+                artist_id = artist.get("id")
+                if not artist_id or artist_id in seen_artist_ids:
+                    continue
+                seen_artist_ids.add(artist_id)
+                
+                image_url = pick_image(artist.get("images") or (), None, 0) or f"/images/artist-{artist.get('name', '').lower().replace(' ', '-')}-circle.png"
+                artists_data.append({
+                    "id": artist_id,
+                    "title": artist.get("name"),
+                    "subtitle": f"{artist.get('followers', {}).get('total', 0):,} followers",
+                    "imageUrl": image_url,
+                    "spotifyId": artist_id
+                })
     
     # Spotify-only: no static defaults.
-    return jsonify(artists_data[:10]), 200
+    return cache_response(cache_key, artists_data[:10], stale=stale), 200
+
+
+def fetch_featured_playlists(token, genres, limit=15):
+    """Spotify featured playlists, topped up with genre playlist searches when there aren't enough"""
+    playlists_data = []
+    seen_playlist_ids = set()
+    
+    # Start the browse call and every genre search together; genre results are only used if browse falls short
+    featured_future = spotify_get_async(f"https://api.spotify.com/v1/browse/featured-playlists?limit={limit}", token, conditional=True)
+    genre_futures = [
+        spotify_get_async(SPOTIFY_SEARCH_URL % (urllib.parse.quote(genre["query"]), "playlist", 3), token)
+        for genre in genres[:limit]
+    ]
+    
+    featured_data = featured_future.result()
+    if featured_data:
+        for playlist in featured_data.get("playlists", {}).get("items", []):
+            if len(playlists_data) >= limit:
+                break
+            image_url = pick_image(playlist.get("images") or (), None, 0)
+            seen_playlist_ids.add(playlist.get("id"))
+            playlists_data.append({
+                "id": playlist.get("id"),
+                "title": playlist.get("name"),
+                "subtitle": playlist.get("description", "")[:50] if playlist.get("description") else f"{playlist.get('tracks', {}).get('total', 0)} tracks",
+                "imageUrl": image_url,
+                "spotifyId": playlist.get("id"),
+                "genre": "Featured"
+            })
+    
+    for genre, future in zip(genres[:limit], genre_futures):
+        if len(playlists_data) >= limit:
+            break
+        data = future.result()
+        if not data:
+            continue
+        # Add multiple playlists from this genre if we still need more
+        for playlist in data.get("playlists", {}).get("items", []):
+            if len(playlists_data) >= limit:
+                break
+            image_url = pick_image(playlist.get("images") or (), None, 0)
+            # Check if already added
+            playlist_id = playlist.get("id")
+            if playlist_id and playlist_id not in seen_playlist_ids:
+                seen_playlist_ids.add(playlist_id)
+                playlists_data.append({
+                    "id": playlist_id,
+                    "title": playlist.get("name"),
+                    "subtitle": f"{genre['name']} • {playlist.get('tracks', {}).get('total', 0)} tracks",
+                    "imageUrl": image_url,
+                    "spotifyId": playlist_id,
+                    "genre": genre["name"]
+                })
+    
+    # Drop genre searches that haven't started yet
+    for future in genre_futures:
+        future.cancel()
+    
+    return playlists_data[:limit]
 
 
 @app.route('/api/featured-playlists', methods=['GET'])
@@ -1175,11 +1641,7 @@ def get_featured_playlists():
     user = User.query.get(user_id)
     
     # Get language preference from query param or user settings
-    language = request.args.get("language")
-    if not language and user:
-        language = user.language or "English"
-    
-    playlists_data = []
+    language = request.args.get("language") or (user and user.language) or "English"
     
     # Filter genres based on language preference
     if language == "Global":
@@ -1252,153 +1714,30 @@ def get_featured_playlists():
     if user and user.spotify_access_token:
         try:
             ensure_valid_spotify_token(user)
-            
-            # Fetch featured playlists from Spotify's browse API
-            try:
-                spotify_resp = requests.get(
-                    "https://api.spotify.com/v1/browse/featured-playlists?limit=15",
-                    headers={"Authorization": f"Bearer {user.spotify_access_token}"}
-                )
-                
-                if spotify_resp.status_code == 200:
-                    featured = spotify_resp.json().get("playlists", {}).get("items", [])
-                    for playlist in featured:
-                        if len(playlists_data) >= 15:
-                            break
-                        images = playlist.get("images", [])
-                        image_url = images[0].get("url") if images else None
-                        playlists_data.append({
-                            "id": playlist.get("id"),
-                            "title": playlist.get("name"),
-                            "subtitle": playlist.get("description", "")[:50] if playlist.get("description") else f"{playlist.get('tracks', {}).get('total', 0)} tracks",
-                            "imageUrl": image_url,
-                            "spotifyId": playlist.get("id"),
-                            "genre": "Featured"
-                        })
-                else:
-                    print(f"Spotify featured playlists API returned status {spotify_resp.status_code}: {spotify_resp.text}")
-            except Exception as e:
-                print(f"Error fetching featured playlists: {e}")
-                # Continue to genre search even if featured fails
-            
-            # Also search for genre-specific playlists if we need more
-            if len(playlists_data) < 15:
-                # Calculate how many we need
-                needed = 15 - len(playlists_data)
-                for genre in genres[:15]:  # Limit to 15 total
-                    if len(playlists_data) >= 15:
-                        break
-                    try:
-                        genre_resp = requests.get(
-                            f"https://api.spotify.com/v1/search?q={urllib.parse.quote(genre['query'])}&type=playlist&limit=3",
-                            headers={"Authorization": f"Bearer {user.spotify_access_token}"}
-                        )
-                        if genre_resp.status_code == 200:
-                            playlists = genre_resp.json().get("playlists", {}).get("items", [])
-                            if playlists:
-                                # Add multiple playlists from this genre if we still need more
-                                for playlist in playlists:
-                                    if len(playlists_data) >= 15:
-                                        break
-                                    images = playlist.get("images", [])
-                                    image_url = images[0].get("url") if images else None
-                                    # Check if already added
-                                    if not any(p.get("spotifyId") == playlist.get("id") for p in playlists_data):
-                                        playlists_data.append({
-                                            "id": playlist.get("id"),
-                                            "title": playlist.get("name"),
-                                            "subtitle": f"{genre['name']} • {playlist.get('tracks', {}).get('total', 0)} tracks",
-                                            "imageUrl": image_url,
-                                            "spotifyId": playlist.get("id"),
-                                            "genre": genre["name"]
-                                        })
-                    except Exception as e:
-                        print(f"Error fetching {genre['name']} playlists: {e}")
-                        continue
-            
-            # Return playlists (even if empty, but at least we tried)
-            return jsonify(playlists_data[:15]), 200
-                    
-        except Exception as e:
-            print(f"Error fetching Spotify playlists: {e}")
-            import traceback
-            traceback.print_exc()
+            return json_response(fetch_featured_playlists(user.spotify_access_token, genres)), 200
+        except Exception:
+            logger.exception("Error fetching Spotify playlists")
             # When Spotify is linked but fails, return empty array (no fallback)
-            return jsonify([]), 200
+            return json_response([]), 200
     
     # Use client credentials token when Spotify is not linked (same as featured-playlists already does)
     spotify_token = get_spotify_token()
     if not spotify_token:
-        return jsonify([]), 200
+        return json_response([]), 200
     
     try:
-        # Try to get playlists using client credentials token
-        # Fetch featured playlists from Spotify's browse API
-        try:
-            spotify_resp = requests.get(
-                "https://api.spotify.com/v1/browse/featured-playlists?limit=15",
-                headers={"Authorization": f"Bearer {spotify_token}"}
-            )
-            
-            if spotify_resp.status_code == 200:
-                featured = spotify_resp.json().get("playlists", {}).get("items", [])
-                for playlist in featured:
-                    if len(playlists_data) >= 15:
-                        break
-                    images = playlist.get("images", [])
-                    image_url = images[0].get("url") if images else None
-                    playlists_data.append({
-                        "id": playlist.get("id"),
-                        "title": playlist.get("name"),
-                        "subtitle": playlist.get("description", "")[:50] if playlist.get("description") else f"{playlist.get('tracks', {}).get('total', 0)} tracks",
-                        "imageUrl": image_url,
-                        "spotifyId": playlist.get("id"),
-                        "genre": "Featured"
-                    })
-            else:
-                print(f"Spotify featured playlists API returned status {spotify_resp.status_code}: {spotify_resp.text}")
-        except Exception as e:
-            print(f"Error fetching featured playlists: {e}")
-            # Continue to genre search even if featured fails
-        
-        # Also search for genre-specific playlists if we need more
-        if len(playlists_data) < 15:
-            for genre in genres[:15]:  # Limit to 15 total
-                if len(playlists_data) >= 15:
-                    break
-                try:
-                    genre_resp = requests.get(
-                        f"https://api.spotify.com/v1/search?q={urllib.parse.quote(genre['query'])}&type=playlist&limit=3",
-                        headers={"Authorization": f"Bearer {spotify_token}"}
-                    )
-                    if genre_resp.status_code == 200:
-                        playlists = genre_resp.json().get("playlists", {}).get("items", [])
-                        if playlists:
-                            # Add multiple playlists from this genre if we still need more
-                            for playlist in playlists:
-                                if len(playlists_data) >= 15:
-                                    break
-                                images = playlist.get("images", [])
-                                image_url = images[0].get("url") if images else None
-                                # Check if already added
-                                if not any(p.get("spotifyId") == playlist.get("id") for p in playlists_data):
-                                    playlists_data.append({
-                                        "id": playlist.get("id"),
-                                        "title": playlist.get("name"),
-                                        "subtitle": f"{genre['name']} • {playlist.get('tracks', {}).get('total', 0)} tracks",
-                                        "imageUrl": image_url,
-                                        "spotifyId": playlist.get("id"),
-                                        "genre": genre["name"]
-                                    })
-                except Exception as e:
-                    print(f"Error fetching {genre['name']} playlists: {e}")
-                    continue
-        
-        # Return playlists (even if empty, but at least we tried)
-        return jsonify(playlists_data[:15]), 200
+        return json_response(fetch_featured_playlists(spotify_token, genres)), 200
     except Exception as e:
-        print(f"Error fetching Spotify playlists with client credentials: {e}")
-        return jsonify([]), 200
+        logger.warning("Error fetching Spotify playlists with client credentials: %s", e)
+        return json_response([]), 200
+
+
+def trending_song_items(token, language, track_image_index):
+    """Trending cards: new releases for Global/English, otherwise a track search in the language"""
+    if language and language not in ("Global", "English"):
+        url = SPOTIFY_SEARCH_URL % (language_config(language).trending_query, "track", 15)
+        return track_song_items(spotify_get_items(url, token, "tracks.items", 15) or (), track_image_index)
+    return album_song_items(spotify_get_items(SPOTIFY_NEW_RELEASES_URL, token, "albums.items", 15) or ())
 
 
 @app.route('/api/trending-songs', methods=['GET'])
@@ -1406,248 +1745,44 @@ def get_featured_playlists():
 def get_trending_songs():
     """Get trending/popular songs"""
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = get_spotify_user(user_id)
     
     # Get language preference from query param or user settings
-    language = request.args.get("language")
-    if not language and user:
-        language = user.language or "English"
+    language = request.args.get("language") or (user and user.language) or "English"
     
-    songs_data = []
+    linked = bool(user and user.spotify_access_token)
+    
+    # Trending results aren't user-specific, so serve them from the response cache before touching Spotify
+    cache_key = f"trending:{'linked' if linked else 'public'}:{language}"
+    cached, stale = cached_response(cache_key)
+    if cached is not None:
+        return cached, 200
     
     # Try Spotify first - if linked, only use Spotify (no fallbacks)
-    if user and user.spotify_access_token:
+    if linked:
         try:
             ensure_valid_spotify_token(user)
-            # Search for trending songs in the selected language
-            if language == "Global":
-                # For Global, get new releases (globally popular)
-                spotify_resp = requests.get(
-                    "https://api.spotify.com/v1/browse/new-releases?limit=15",
-                    headers={"Authorization": f"Bearer {user.spotify_access_token}"}
-                )
-            elif language and language != "English":
-                # Map language to search query
-                lang_queries = {
-                    "Hindi": "hindi bollywood",
-                    "Bengali": "bengali",
-                    "Marathi": "marathi",
-                    "Telugu": "telugu",
-                    "Tamil": "tamil"
-                }
-                search_query = lang_queries.get(language, language.lower())
-                spotify_resp = requests.get(
-                    f"https://api.spotify.com/v1/search?q={urllib.parse.quote(search_query)}&type=track&limit=15",
-                    headers={"Authorization": f"Bearer {user.spotify_access_token}"}
-                )
-            else:
-                # Get featured playlists or new releases for English/default
-                spotify_resp = requests.get(
-                    "https://api.spotify.com/v1/browse/new-releases?limit=15",
-                    headers={"Authorization": f"Bearer {user.spotify_access_token}"}
-                )
-            if spotify_resp.status_code == 200:
-                if language == "Global" or (language and language != "English"):
-                    if language == "Global":
-                        # For Global, use new releases (already fetched above)
-                        albums = spotify_resp.json().get("albums", {}).get("items", [])
-                        for album in albums:
-                            images = album.get("images", [])
-                            image_url = images[0].get("url") if images else None
-                            artists = album.get("artists", [])
-                            artist_name = ", ".join([a.get("name") for a in artists]) if artists else "Unknown"
-                            album_id = album.get("id")
-                            
-                            # Use album URL directly
-                            spotify_uri = f"spotify:album:{album_id}"
-                            spotify_url = f"https://open.spotify.com/album/{album_id}"
-                            
-                            songs_data.append({
-                                "id": album_id,
-                                "title": album.get("name"),
-                                "subtitle": artist_name,
-                                "imageUrl": image_url,
-                                "album": album.get("name"),
-                                "artist": artist_name,
-                                "spotifyId": album_id,
-                                "spotifyUri": spotify_uri,
-                                "spotifyUrl": spotify_url
-                            })
-                    else:
-                        # Handle track search results for specific languages
-                        tracks = spotify_resp.json().get("tracks", {}).get("items", [])
-                        seen_track_ids = set()
-                        for track in tracks:
-                            track_id = track.get("id")
-                            if track_id in seen_track_ids:
-                                continue
-                            seen_track_ids.add(track_id)
-                            
-                            album = track.get("album", {})
-                            images = album.get("images", [])
-                            image_url = images[1].get("url") if len(images) > 1 else (images[0].get("url") if images else None)
-                            artists = track.get("artists", [])
-                            artist_name = ", ".join([a.get("name") for a in artists]) if artists else "Unknown"
-                            
-                            songs_data.append({
-                                "id": track_id,
-                                "title": track.get("name"),
-                                "subtitle": artist_name,
-                                "imageUrl": image_url,
-                                "album": album.get("name"),
-                                "artist": artist_name,
-                                "spotifyId": track_id,
-                                "spotifyUri": track.get("uri"),
-                                "spotifyUrl": f"https://open.spotify.com/track/{track_id}"
-                            })
-                else:
-                    # Handle album results (new releases) for English
-                    albums = spotify_resp.json().get("albums", {}).get("items", [])
-                    for album in albums:
-                        images = album.get("images", [])
-                        image_url = images[0].get("url") if images else None
-                        artists = album.get("artists", [])
-                        artist_name = ", ".join([a.get("name") for a in artists]) if artists else "Unknown"
-                        album_id = album.get("id")
-                        
-                        # Use album URL directly (faster, and users can see all tracks in the album)
-                        spotify_uri = f"spotify:album:{album_id}"
-                        spotify_url = f"https://open.spotify.com/album/{album_id}"
-                        
-                        songs_data.append({
-                            "id": album_id,
-                            "title": album.get("name"),
-                            "subtitle": artist_name,
-                            "imageUrl": image_url,
-                            "album": album.get("name"),
-                            "artist": artist_name,
-                            "spotifyId": album_id,
-                            "spotifyUri": spotify_uri,
-                            "spotifyUrl": spotify_url
-                        })
+            songs_data = trending_song_items(user.spotify_access_token, language, 1)
             # Return only 15 items max when Spotify is linked (no fallbacks)
-            return jsonify(songs_data[:15]), 200
-        except Exception as e:
-            print(f"Error fetching Spotify trending: {e}")
-            import traceback
-            traceback.print_exc()
+            return cache_response(cache_key, songs_data[:15], stale=stale), 200
+        except Exception:
+            logger.exception("Error fetching Spotify trending")
             # When Spotify is linked but fails, return empty array (no fallback)
-            return jsonify([]), 200
+            return fallback_response(stale), 200
     
     # Use client credentials token when Spotify is not linked
     spotify_token = get_spotify_token()
     if not spotify_token:
-        return jsonify([]), 200
+        return fallback_response(stale), 200
     
     try:
-        # Try to get trending songs using client credentials token
-        # Search for trending songs in the selected language
-        if language == "Global":
-            # For Global, get new releases (globally popular)
-            spotify_resp = requests.get(
-                "https://api.spotify.com/v1/browse/new-releases?limit=15",
-                headers={"Authorization": f"Bearer {spotify_token}"}
-            )
-        elif language and language != "English":
-            # Map language to search query
-            lang_queries = {
-                "Hindi": "hindi bollywood",
-                "Bengali": "bengali",
-                "Marathi": "marathi",
-                "Telugu": "telugu",
-                "Tamil": "tamil"
-            }
-            search_query = lang_queries.get(language, language.lower())
-            spotify_resp = requests.get(
-                f"https://api.spotify.com/v1/search?q={urllib.parse.quote(search_query)}&type=track&limit=15",
-                headers={"Authorization": f"Bearer {spotify_token}"}
-            )
-        else:
-            # Get new releases for English/default
-            spotify_resp = requests.get(
-                "https://api.spotify.com/v1/browse/new-releases?limit=15",
-                headers={"Authorization": f"Bearer {spotify_token}"}
-            )
-        if spotify_resp.status_code == 200:
-            if language == "Global":
-                # For Global, use new releases (already fetched above)
-                albums = spotify_resp.json().get("albums", {}).get("items", [])
-                for album in albums:
-                    images = album.get("images", [])
-                    image_url = images[0].get("url") if images else None
-                    artists = album.get("artists", [])
-                    artist_name = ", ".join([a.get("name") for a in artists]) if artists else "Unknown"
-                    album_id = album.get("id")
-                    
-                    # Use album URL directly
-                    spotify_uri = f"spotify:album:{album_id}"
-                    spotify_url = f"https://open.spotify.com/album/{album_id}"
-                    
-                    songs_data.append({
-                        "id": album_id,
-                        "title": album.get("name"),
-                        "subtitle": artist_name,
-                        "imageUrl": image_url,
-                        "album": album.get("name"),
-                        "artist": artist_name,
-                        "spotifyId": album_id,
-                        "spotifyUri": spotify_uri,
-                        "spotifyUrl": spotify_url
-                    })
-            elif language and language != "English":
-                # Handle track results for language-specific searches
-                tracks = spotify_resp.json().get("tracks", {}).get("items", [])
-                for track in tracks:
-                    track_id = track.get("id")
-                    album = track.get("album", {})
-                    images = album.get("images", [])
-                    image_url = images[0].get("url") if images else None
-                    artists = track.get("artists", [])
-                    artist_name = ", ".join([a.get("name") for a in artists]) if artists else "Unknown"
-                    
-                    songs_data.append({
-                        "id": track_id,
-                        "title": track.get("name"),
-                        "subtitle": artist_name,
-                        "imageUrl": image_url,
-                        "album": album.get("name"),
-                        "artist": artist_name,
-                        "spotifyId": track_id,
-                        "spotifyUri": track.get("uri"),
-                        "spotifyUrl": f"https://open.spotify.com/track/{track_id}"
-                    })
-            else:
-                # Handle album results (new releases) for English
-                albums = spotify_resp.json().get("albums", {}).get("items", [])
-                for album in albums:
-                    images = album.get("images", [])
-                    image_url = images[0].get("url") if images else None
-                    artists = album.get("artists", [])
-                    artist_name = ", ".join([a.get("name") for a in artists]) if artists else "Unknown"
-                    album_id = album.get("id")
-                    
-                    # Use album URL directly
-                    spotify_uri = f"spotify:album:{album_id}"
-                    spotify_url = f"https://open.spotify.com/album/{album_id}"
-                    
-                    songs_data.append({
-                        "id": album_id,
-                        "title": album.get("name"),
-                        "subtitle": artist_name,
-                        "imageUrl": image_url,
-                        "album": album.get("name"),
-                        "artist": artist_name,
-                        "spotifyId": album_id,
-                        "spotifyUri": spotify_uri,
-                        "spotifyUrl": spotify_url
-                    })
+        # Client-credentials results use the largest cover image
+        songs_data = trending_song_items(spotify_token, language, 0)
         # Return only 15 items max
-        return jsonify(songs_data[:15]), 200
-    except Exception as e:
-        print(f"Error fetching Spotify trending songs with client credentials: {e}")
-        import traceback
-        traceback.print_exc()
-        return jsonify([]), 200
+        return cache_response(cache_key, songs_data[:15], stale=stale), 200
+    except Exception:
+        logger.exception("Error fetching Spotify trending songs with client credentials")
+        return fallback_response(stale), 200
 
 
 @app.route('/api/industry-songs', methods=['GET'])
@@ -1655,152 +1790,205 @@ def get_trending_songs():
 def get_industry_songs():
     """Get industry/popular songs for Industry section - different from trending songs"""
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = get_spotify_user(user_id)
     
     # Get language preference from query param or user settings
-    language = request.args.get("language")
-    if not language and user:
-        language = user.language or "English"
+    language = request.args.get("language") or (user and user.language) or "English"
     
     # Get exclude IDs from query parameter (comma-separated list of trending song IDs)
-    exclude_ids_param = request.args.get("exclude_ids", "")
-    exclude_ids = set(exclude_ids_param.split(",")) if exclude_ids_param else set()
+    exclude_ids = parse_exclude_ids(request.args.get("exclude_ids", ""))
+    linked = bool(user and user.spotify_access_token)
+    exclude_hash = hashlib.sha1(",".join(sorted(exclude_ids)).encode()).hexdigest()
+    cache_key = f"industry:{'linked' if linked else 'public'}:{language}:{exclude_hash}"
+    cached, stale = cached_response(cache_key)
+    if cached is not None:
+        return cached, 200
     
     songs_data = []
-    seen_track_ids = set(exclude_ids)  # Start with excluded IDs to avoid duplicates
+    seen_track_ids = exclude_ids  # Start with excluded IDs to avoid duplicates
     
     # If user has Spotify, fetch industry songs from Spotify - only Spotify, no fallbacks
-    if user and user.spotify_access_token:
+    if linked:
         try:
             ensure_valid_spotify_token(user)
             
             # Use different search queries than trending songs (industry-focused)
-            search_queries = []
-            if language == "Global":
-                search_queries = ["chart hits", "viral songs", "trending now", "popular music", "top charts", "new releases", "latest hits", "billboard top", "music charts"]
-            elif language == "Hindi":
-                search_queries = ["hindi chart", "bollywood chart", "indian hits", "hindi trending", "bollywood viral", "latest hindi", "new bollywood", "indian top songs"]
-            elif language == "English":
-                search_queries = ["chart top", "viral hits", "trending music", "popular chart", "top music", "new releases", "latest songs", "billboard hot", "top charts"]
-            elif language == "Bengali":
-                search_queries = ["bengali chart", "bengali viral", "bengali trending", "latest bengali", "new bengali"]
-            elif language == "Marathi":
-                search_queries = ["marathi chart", "marathi viral", "marathi trending", "latest marathi", "new marathi"]
-            elif language == "Telugu":
-                search_queries = ["telugu chart", "telugu viral", "telugu trending", "latest telugu", "new telugu"]
-            elif language == "Tamil":
-                search_queries = ["tamil chart", "tamil viral", "tamil trending", "latest tamil", "new tamil"]
-            else:
-                search_queries = [f"{language} chart", f"{language} viral", f"{language} trending", f"latest {language}", f"new {language}"]
+            search_queries = language_config(language).industry_queries
             
-            for query in search_queries:
+            urls = [SPOTIFY_SEARCH_URL % (query, "track", 15) for query in search_queries]
+            # At most 15 tracks are kept overall, so ask for and parse no more than 15 per query
+            for tracks in spotify_get_items_many(urls, user.spotify_access_token, "tracks.items", 15):
                 if len(songs_data) >= 15:
                     break
-                try:
-                    spotify_resp = requests.get(
-                        f"https://api.spotify.com/v1/search?q={urllib.parse.quote(query)}&type=track&limit=20",
-                        headers={"Authorization": f"Bearer {user.spotify_access_token}"},
-                        timeout=3
-                    )
-                    if spotify_resp.status_code == 200:
-                        tracks = spotify_resp.json().get("tracks", {}).get("items", [])
-                        for track in tracks:
-                            if len(songs_data) >= 15:
-                                break
-                            track_id = track.get("id")
-                            if not track_id or track_id in seen_track_ids:
-                                continue
-                            seen_track_ids.add(track_id)
-                            
-                            album = track.get("album", {})
-                            images = album.get("images", [])
-                            image_url = images[1].get("url") if len(images) > 1 else (images[0].get("url") if images else None)
-                            artists = track.get("artists", [])
-                            artist_name = ", ".join([a.get("name") for a in artists]) if artists else "Unknown"
-                            
-                            songs_data.append({
-                                "id": track_id,
-                                "title": track.get("name"),
-                                "subtitle": artist_name,
-                                "imageUrl": image_url,
-                                "album": album.get("name"),
-                                "artist": artist_name,
-                                "spotifyId": track_id,
-                                "spotifyUri": track.get("uri"),
-                                "spotifyUrl": f"https://open.spotify.com/track/{track_id}",
-                                "source": "Spotify"
-                            })
-                except Exception as e:
-                    print(f"Error with industry search query '{query}': {e}")
+                if not tracks:
                     continue
+                for track in tracks:
+                    if len(songs_data) >= 15:
+                        break
+                    track_id = track.get("id")
+                    if not track_id or track_id in seen_track_ids:
+                        continue
+                    seen_track_ids.add(track_id)
+                    
+                    album = track.get("album", {})
+                    image_url = pick_image(album.get("images", ()))
+                    artists = track.get("artists", [])
+                    artist_name = join_artist_names(artists)
+                    
+                    songs_data.append(SpotifySongCard(
+                        id=track_id,
+                        title=track.get("name"),
+                        subtitle=artist_name,
+                        imageUrl=image_url,
+                        album=album.get("name"),
+                        artist=artist_name,
+                        spotifyId=track_id,
+                        spotifyUri=track.get("uri"),
+                        spotifyUrl=spotify_track_url(track_id),
+                        source="Spotify"
+                    ))
             
             # Return only 15 items max when Spotify is linked (no fallbacks)
-            return jsonify(songs_data[:15]), 200
-        except Exception as e:
-            print(f"Error fetching Spotify industry songs: {e}")
-            import traceback
-            traceback.print_exc()
+            return cache_response(cache_key, songs_data[:15], stale=stale), 200
+        except Exception:
+            logger.exception("Error fetching Spotify industry songs")
             # When Spotify is linked but fails, return empty array (no fallback)
-            return jsonify([]), 200
+            return fallback_response(stale), 200
     
     # Fallback to public industry-songs API - only when Spotify NOT linked
     # Use public API which uses client credentials
     spotify_token = get_spotify_token()
-    
-    if spotify_token:
-        search_queries = []
-        if language == "Global":
-            search_queries = ["chart hits", "viral songs", "trending now", "popular music", "top charts", "new releases", "latest hits"]
-        elif language == "Hindi":
-            search_queries = ["hindi chart", "bollywood chart", "indian hits", "hindi trending", "bollywood viral", "latest hindi", "new bollywood"]
-        elif language == "English":
-            search_queries = ["chart top", "viral hits", "trending music", "popular chart", "top music", "new releases", "latest songs"]
-        else:
-            search_queries = [f"{language} chart", f"{language} viral", f"{language} trending", f"latest {language}", f"new {language}"]
-        
-        for query in search_queries:
+    if not spotify_token:
+        return fallback_response(stale), 200
+    
+    # Same queries as the public industry endpoint (already URL-encoded)
+    search_queries = language_config(language).public_industry_queries
+    
+    urls = [SPOTIFY_SEARCH_URL % (query, "track", 15) for query in search_queries]
+    # At most 15 tracks are kept overall, so ask for and parse no more than 15 per query
+    for tracks in spotify_get_items_many(urls, spotify_token, "tracks.items", 15):
+        if len(songs_data) >= 15:
+            break
+        if not tracks:
+            continue
+        for track in tracks:
             if len(songs_data) >= 15:
                 break
-            try:
-                spotify_resp = requests.get(
-                    f"https://api.spotify.com/v1/search?q={urllib.parse.quote(query)}&type=track&limit=20",
-                    headers={"Authorization": f"Bearer {spotify_token}"},
-                    timeout=3
-                )
-                if spotify_resp.status_code == 200:
-                    tracks = spotify_resp.json().get("tracks", {}).get("items", [])
-                    for track in tracks:
-                        if len(songs_data) >= 15:
-                            break
-                        track_id = track.get("id")
-                        if not track_id or track_id in seen_track_ids:
-                            continue
-                        seen_track_ids.add(track_id)
-                        
-                        album = track.get("album", {})
-                        images = album.get("images", [])
-                        image_url = images[1].get("url") if len(images) > 1 else (images[0].get("url") if images else "/images/song-1.png")
-                        artists = track.get("artists", [])
-                        artist_name = ", ".join([a.get("name") for a in artists]) if artists else "Unknown"
-                        
-                        songs_data.append({
-                            "id": track_id,
-                            "title": track.get("name"),
-                            "subtitle": artist_name,
-                            "imageUrl": image_url,
-                            "album": album.get("name"),
-                            "artist": artist_name,
-                            "spotifyId": track_id,
-                            "spotifyUri": track.get("uri"),
-                            "spotifyUrl": f"https://open.spotify.com/track/{track_id}",
-                            "source": "Spotify"
-                        })
-            except Exception as e:
-                print(f"Error with industry search query '{query}': {e}")
+            track_id = track.get("id")
+            if not track_id or track_id in seen_track_ids:
                 continue
+            seen_track_ids.add(track_id)
+            
+            album = track.get("album", {})
+            image_url = pick_image(album.get("images", ()), "/images/song-1.png")
+            artists = track.get("artists", [])
+            artist_name = join_artist_names(artists)
+            
+            songs_data.append(SpotifySongCard(
+                id=track_id,
+                title=track.get("name"),
+                subtitle=artist_name,
+                imageUrl=image_url,
+                album=album.get("name"),
+                artist=artist_name,
+                spotifyId=track_id,
+                spotifyUri=track.get("uri"),
+                spotifyUrl=spotify_track_url(track_id),
+                source="Spotify"
+            ))
     
     # Return only 15 items max
-    return jsonify(songs_data[:15]), 200
+    return cache_response(cache_key, songs_data[:15], stale=stale), 200
+
+
+# Artist search hits are public metadata that rarely changes, so they are shared by all users for a day
+ARTIST_LOOKUP_TTL = 24 * 60 * 60
+
+
+def lookup_artists(artist_names, token):
+    """Spotify artist (or None) for each name, served from the shared cache where possible"""
+    cache_keys = [f"artist:{hashlib.sha1(name.encode()).hexdigest()}" for name in artist_names]
+    results = []
+    known_ids = []  # (index, Spotify ID) for misses in ARTIST_ID_BY_NAME
+    to_search = []  # indexes of misses that have to be searched by name
+    for index, key in enumerate(cache_keys):
+        payload = get_cached(key)
+        if payload is not None:
+            results.append(json.loads(payload))
+            continue
+        results.append(None)
+        artist_id = ARTIST_ID_BY_NAME.get(artist_names[index])
+        if artist_id:
+            known_ids.append((index, artist_id))
+        else:
+            to_search.append(index)
+    
+    if not known_ids and not to_search:
+        return results
+    
+    # Client-credentials results are shareable; fall back to the caller's token if they are unavailable
+    lookup_token = get_spotify_token() or token
+    # Known IDs go out as one batched request (up to 50 IDs) alongside the name searches
+    id_futures = [
+        (chunk, spotify_get_async(SPOTIFY_ARTISTS_URL % ",".join(artist_id for _, artist_id in chunk), lookup_token))
+        for chunk in (known_ids[start:start + 50] for start in range(0, len(known_ids), 50))
+    ]
+    urls = [
+        ARTIST_SEARCH_URLS.get(artist_names[index]) or SPOTIFY_SEARCH_URL % (urllib.parse.quote(artist_names[index]), "artist", 1)
+        for index in to_search
+    ]
+    found = []
+    for index, data in zip(to_search, spotify_get_many(urls, lookup_token)):
+        if data is not None:
+            items = data.get("artists", {}).get("items", [])
+            found.append((index, items[0] if items else None))
+    for chunk, future in id_futures:
+        data = future.result()
+        if data is not None:
+            found.extend(zip((index for index, _ in chunk), data.get("artists", [])))
+    
+    # Failed requests are left uncached so they are retried next time
+    for index, artist in found:
+        if artist:
+            artist = {key: artist.get(key) for key in ("id", "name", "images", "followers")}
+        results[index] = artist
+        set_cached(cache_keys[index], dumps(artist), ARTIST_LOOKUP_TTL)
+    return results
+
+
+def search_popular_artists(artist_names, token, limit=15):
+    """Top search hit for each name, deduplicated by ID and name; lookups run concurrently in batches of limit"""
+    artists_data = []
+    seen_artist_ids = set()  # Track unique artist IDs
+    seen_artist_names = set()  # Track unique artist names (case-insensitive)
+    # Only look up the next batch if duplicates left us short of limit
+    for start in range(0, len(artist_names), limit):
+        if len(artists_data) >= limit:
+            break
+        for artist in lookup_artists(artist_names[start:start + limit], token):
+            if len(artists_data) >= limit:
+                break
+            if not artist:
+                continue
+            artist_id = artist.get("id")
+            artist_name_lower = (artist.get("name") or "").lower().strip()
+            
+            # Skip if we've already seen this artist (by ID or name)
+            if artist_id in seen_artist_ids or artist_name_lower in seen_artist_names:
+                continue
+            
+            seen_artist_ids.add(artist_id)
+            seen_artist_names.add(artist_name_lower)
+            
+            image_url = pick_image(artist.get("images") or (), None, 0)
+            artists_data.append({
+                "id": artist_id,
+                "title": artist.get("name"),
+                "subtitle": f"{(artist.get('followers') or {}).get('total', 0)} followers",
+                "imageUrl": image_url,
+                "spotifyId": artist_id
+            })
+    return artists_data
 
 
 @app.route('/api/artists', methods=['GET'])
@@ -1808,205 +1996,49 @@ def get_industry_songs():
 def get_artists():
     """Get popular artists"""
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = get_spotify_user(user_id)
     
     # Get language preference from query param or user settings
-    language = request.args.get("language")
-    if not language and user:
-        language = user.language or "English"
+    language = request.args.get("language") or (user and user.language) or "English"
     
     # Log for debugging
-    print(f"[Artists API] Language received: {language}, Query param: {request.args.get('language')}, User language: {user.language if user else 'N/A'}")
+    logger.debug("[Artists API] Language received: %s, Query param: %s, User language: %s", language, request.args.get('language'), user.language if user else 'N/A')
     
-    artists_data = []
-    seen_artist_ids = set()  # Track unique artist IDs
-    seen_artist_names = set()  # Track unique artist names (case-insensitive)
+    # Artist lookups use shareable client-credentials results, so linked and unlinked users share one entry
+    cache_key = f"artists:{language}"
+    cached, stale = cached_response(cache_key)
+    if cached is not None:
+        return cached, 200
     
     # Try Spotify first
     if user and user.spotify_access_token:
         try:
             ensure_valid_spotify_token(user)
-            # Search for popular artists based on language
-            if language == "Global":
-                # Global: Mix of popular artists from different languages and regions
-                popular_artists = [
-                    "Ed Sheeran", "Taylor Swift", "The Weeknd", "Drake", "Adele",
-                    "Billie Eilish", "Post Malone", "Dua Lipa", "Justin Bieber",
-                    "Ariana Grande", "Bruno Mars", "Coldplay", "Imagine Dragons",
-                    "Arijit Singh", "Shreya Ghoshal", "A.R. Rahman", "The Weeknd",
-                    "BTS", "Bad Bunny", "J Balvin", "Shakira", "Eminem",
-                    "Kanye West", "Kendrick Lamar", "Lana Del Rey", "Rihanna",
-                    "Beyoncé", "The Beatles", "Queen", "Drake"
-                ]
-            elif language == "Hindi":
-                popular_artists = [
-                    "Arijit Singh", "Sonu Nigam", "Shreya Ghoshal", "Atif Aslam",
-                    "Kumar Sanu", "Udit Narayan", "Alka Yagnik", "Kishore Kumar",
-                    "Lata Mangeshkar", "Mohammed Rafi", "A.R. Rahman", "Vishal-Shekhar"
-                ]
-            elif language == "Bengali":
-                popular_artists = [
-                    "Anupam Roy", "Rupam Islam", "Nachiketa", "Srikanto Acharya",
-                    "Lopamudra Mitra", "Shreya Ghoshal", "Arijit Singh"
-                ]
-            elif language == "Marathi":
-                popular_artists = [
-                    "Ajay-Atul", "Shankar Mahadevan", "Sonu Nigam", "Shreya Ghoshal"
-                ]
-            elif language == "Telugu":
-                popular_artists = [
-                    "S.P. Balasubrahmanyam", "K.S. Chithra", "Sid Sriram", "Anirudh Ravichander"
-                ]
-            elif language == "Tamil":
-                popular_artists = [
-                    "A.R. Rahman", "Ilaiyaraaja", "Anirudh Ravichander", "Yuvan Shankar Raja",
-                    "Sid Sriram", "Shreya Ghoshal"
-                ]
-            else:
-                # Default English/International artists
-                popular_artists = [
-                    "Ed Sheeran", "Taylor Swift", "The Weeknd", "Drake", "Adele",
-                    "Billie Eilish", "Post Malone", "Dua Lipa", "Justin Bieber",
-                    "Ariana Grande", "Bruno Mars", "Coldplay", "Imagine Dragons",
-                    "Eminem", "Kanye West", "Kendrick Lamar", "Lana Del Rey",
-                    "Rihanna", "Beyoncé", "The Beatles", "Queen"
-                ]
-            for artist_name in popular_artists:
-                if len(artists_data) >= 15:
-                    break
-                try:
-                    spotify_resp = requests.get(
-                        f"https://api.spotify.com/v1/search?q={urllib.parse.quote(artist_name)}&type=artist&limit=1",
-                        headers={"Authorization": f"Bearer {user.spotify_access_token}"}
-                    )
-                    if spotify_resp.status_code == 200:
-                        artists = spotify_resp.json().get("artists", {}).get("items", [])
-                        if artists:
-                            artist = artists[0]
-                            artist_id = artist.get("id")
-                            artist_name_lower = artist.get("name", "").lower().strip()
-                            
-                            # Skip if we've already seen this artist (by ID or name)
-                            if artist_id in seen_artist_ids or artist_name_lower in seen_artist_names:
-                                continue
-                            
-                            seen_artist_ids.add(artist_id)
-                            seen_artist_names.add(artist_name_lower)
-                            
-                            images = artist.get("images", [])
-                            image_url = images[0].get("url") if images else None
-                            artists_data.append({
-                                "id": artist_id,
-                                "title": artist.get("name"),
-                                "subtitle": f"{artist.get('followers', {}).get('total', 0)} followers",
-                                "imageUrl": image_url,
-                                "spotifyId": artist_id
-                            })
-                except Exception as e:
-                    print(f"Error fetching artist {artist_name}: {e}")
-                    continue
+            popular_artists = language_config(language).artists
+            artists_data = search_popular_artists(popular_artists, user.spotify_access_token)
             
             # Return only 15 items max when Spotify is linked (no fallbacks)
-            return jsonify(artists_data[:15]), 200
+            return cache_response(cache_key, artists_data[:15], stale=stale), 200
         except Exception as e:
-            print(f"Error fetching Spotify artists: {e}")
+            logger.warning("Error fetching Spotify artists: %s", e)
             # When Spotify is linked but fails, return empty array (no fallback)
-            return jsonify([]), 200
+            return fallback_response(stale), 200
     
     # Use client credentials token when Spotify is not linked
     spotify_token = get_spotify_token()
     if not spotify_token:
-        return jsonify([]), 200
+        return fallback_response(stale), 200
     
     try:
         # Try to get artists using client credentials token
-        # Search for popular artists based on language
-        if language == "Global":
-            # Global: Mix of popular artists from different languages and regions
-            popular_artists = [
-                "Ed Sheeran", "Taylor Swift", "The Weeknd", "Drake", "Adele",
-                "Billie Eilish", "Post Malone", "Dua Lipa", "Justin Bieber",
-                "Ariana Grande", "Bruno Mars", "Coldplay", "Imagine Dragons",
-                "Arijit Singh", "Shreya Ghoshal", "A.R. Rahman",
-                "BTS", "Bad Bunny", "J Balvin", "Shakira", "Eminem",
-                "Kanye West", "Kendrick Lamar", "Lana Del Rey", "Rihanna",
-                "Beyoncé", "The Beatles", "Queen"
-            ]
-        elif language == "Hindi":
-            popular_artists = [
-                "Arijit Singh", "Sonu Nigam", "Shreya Ghoshal", "Atif Aslam",
-                "Kumar Sanu", "Udit Narayan", "Alka Yagnik", "Kishore Kumar",
-                "Lata Mangeshkar", "Mohammed Rafi", "A.R. Rahman", "Vishal-Shekhar"
-            ]
-        elif language == "Bengali":
-            popular_artists = [
-                "Anupam Roy", "Rupam Islam", "Nachiketa", "Srikanto Acharya",
-                "Lopamudra Mitra", "Shreya Ghoshal", "Arijit Singh"
-            ]
-        elif language == "Marathi":
-            popular_artists = [
-                "Ajay-Atul", "Shankar Mahadevan", "Sonu Nigam", "Shreya Ghoshal"
-            ]
-        elif language == "Telugu":
-            popular_artists = [
-                "S.P. Balasubrahmanyam", "K.S. Chithra", "Sid Sriram", "Anirudh Ravichander"
-            ]
-        elif language == "Tamil":
-            popular_artists = [
-                "A.R. Rahman", "Ilaiyaraaja", "Anirudh Ravichander", "Yuvan Shankar Raja",
-                "Sid Sriram", "Shreya Ghoshal"
-            ]
-        else:
-            # Default English/International artists
-            popular_artists = [
-                "Ed Sheeran", "Taylor Swift", "The Weeknd", "Drake", "Adele",
-                "Billie Eilish", "Post Malone", "Dua Lipa", "Justin Bieber",
-                "Ariana Grande", "Bruno Mars", "Coldplay", "Imagine Dragons",
-                "Eminem", "Kanye West", "Kendrick Lamar", "Lana Del Rey",
-                "Rihanna", "Beyoncé", "The Beatles", "Queen"
-            ]
-        for artist_name in popular_artists:
-            if len(artists_data) >= 15:
-                break
-            try:
-                spotify_resp = requests.get(
-                    f"https://api.spotify.com/v1/search?q={urllib.parse.quote(artist_name)}&type=artist&limit=1",
-                    headers={"Authorization": f"Bearer {spotify_token}"}
-                )
-                if spotify_resp.status_code == 200:
-                    artists = spotify_resp.json().get("artists", {}).get("items", [])
-                    if artists:
-                        artist = artists[0]
-                        artist_id = artist.get("id")
-                        artist_name_lower = artist.get("name", "").lower().strip()
-                        
-                        # Skip if we've already seen this artist (by ID or name)
-                        if artist_id in seen_artist_ids or artist_name_lower in seen_artist_names:
-                            continue
-                        
-                        seen_artist_ids.add(artist_id)
-                        seen_artist_names.add(artist_name_lower)
-                        
-                        images = artist.get("images", [])
-                        image_url = images[0].get("url") if images else None
-                        artists_data.append({
-                            "id": artist_id,
-                            "title": artist.get("name"),
-                            "subtitle": f"{artist.get('followers', {}).get('total', 0)} followers",
-                            "imageUrl": image_url,
-                            "spotifyId": artist_id
-                        })
-            except Exception as e:
-                print(f"Error fetching artist {artist_name}: {e}")
-                continue
+        popular_artists = language_config(language).artists
+        artists_data = search_popular_artists(popular_artists, spotify_token)
         
         # Return only 15 items max
-        return jsonify(artists_data[:15]), 200
-    except Exception as e:
-        print(f"Error fetching Spotify artists with client credentials: {e}")
-        import traceback
-        traceback.print_exc()
-        return jsonify([]), 200
+        return cache_response(cache_key, artists_data[:15], stale=stale), 200
+    except Exception:
+        logger.exception("Error fetching Spotify artists with client credentials")
+        return fallback_response(stale), 200
 
 
 @app.route('/api/playlists', methods=['POST'])
@@ -2016,12 +2048,12 @@ def create_playlist():
     data = request.get_json()
     name = data.get("name")
     if not name:
-        return jsonify({"error": "Missing playlist name"}), 400
+        return json_response({"error": "Missing playlist name"}), 400
 
     playlist = Playlist(user_id=user_id, name=name, description=data.get("description", ""))
     db.session.add(playlist)
     db.session.commit()
-    return jsonify({"message": "Playlist created", "playlistId": playlist.id}), 201
+    return json_response({"message": "Playlist created", "playlistId": playlist.id}), 201
 
 
 # ======================================================
@@ -2034,10 +2066,19 @@ def map_gesture_to_action():
     data = request.get_json()
     gesture, action = data.get("gestureName"), data.get("action")
     if not gesture or not action:
-        return jsonify({"error": "Invalid gesture name or action"}), 400
-    db.session.add(GestureLog(user_id=user_id, gesture=f"{gesture}:{action}"))
-    db.session.commit()
-    return jsonify({"message": "Gesture mapped successfully"}), 200
+        return json_response({"error": "Invalid gesture name or action"}), 400
+    # Persisted by the batched log writer rather than a commit per gesture
+    buffer_log(GestureLog, user_id=user_id, gesture=f"{gesture}:{action}", timestamp=datetime.datetime.utcnow())
+    return json_response({"message": "Gesture mapped successfully"}), 202
+
+
+# Recognized voice command phrases (lowercase) and the player action each triggers
+VOICE_PHRASE_TO_ACTION = {
+    "play next song": "next_song",
+    "play previous song": "previous_song",
+    "pause song": "pause",
+    "play song": "play"
+}
 
 
 @app.route('/api/voice/command', methods=['POST'])
@@ -2047,211 +2088,225 @@ def process_voice_command():
     data = request.get_json()
     command = data.get("commandPhrase")
     if not command:
-        return jsonify({"error": "Missing command phrase"}), 400
+        return json_response({"error": "Missing command phrase"}), 400
 
-    phrase_to_action = {
-        "play next song": "next_song",
-        "play previous song": "previous_song",
-        "pause song": "pause",
-        "play song": "play"
-    }
-    action = phrase_to_action.get(command.lower())
+    action = VOICE_PHRASE_TO_ACTION.get(command.lower())
     if not action:
-        return jsonify({"error": "Unrecognized command"}), 400
+        return json_response({"error": "Unrecognized command"}), 400
 
-    db.session.add(VoiceCommandLog(user_id=user_id, command=command))
-    db.session.commit()
-    return jsonify({"message": "Voice command processed", "actionExecuted": action}), 200
+    buffer_log(VoiceCommandLog, user_id=user_id, command=command, timestamp=datetime.datetime.utcnow())
+    return json_response({"message": "Voice command processed", "actionExecuted": action}), 202
 
 
 # ======================================================
 # 6️⃣  User Settings & Preferences
 # ======================================================
 
+# Columns each settings/profile endpoint reads or writes, so the rest of the row (e.g. profile pictures) stays in the DB
+PREFERENCE_COLUMNS = (User.theme, User.language, User.camera_access_enabled, User.notifications_enabled, User.add_to_home_enabled)
+# Values written into preference columns left NULL by rows that predate their server defaults
+PREFERENCE_DEFAULTS = dict(zip(PREFERENCE_COLUMNS, ("light", "English", True, True, False)))
+# Fields cleared when an account link is removed, per provider
+OAUTH_UNLINK_VALUES = {
+    "spotify": dict.fromkeys((
+        "spotify_id", "spotify_display_name", "spotify_email",
+        "spotify_access_token", "spotify_refresh_token", "spotify_token_expires_at"
+    )),
+    "google": dict.fromkeys(("google_id", "google_email", "google_name", "google_access_token", "google_refresh_token")),
+}
+# Display fields for GET /api/profile; the Spotify token is reduced to a flag in SQL so it never leaves the DB
+PROFILE_SELECT = select(
+    User.id, User.email, User.first_name, User.username, User.phone_number, User.bio, User.profile_picture_url,
+    User.spotify_id, User.spotify_display_name, User.spotify_email,
+    and_(User.spotify_access_token.isnot(None), User.spotify_access_token != "").label("spotify_linked"),
+    User.google_id, User.google_name, User.google_email
+)
+PROFILE_EDIT_COLUMNS = (User.first_name, User.username, User.phone_number, User.bio)
+
+
 @app.route('/api/settings/preferences', methods=['GET'])
 @jwt_required()
 def get_preferences():
     """Get user preferences"""
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({"error": "User not found"}), 404
-    
-    return jsonify({
-        "theme": user.theme or "light",
-        "language": user.language or "English",
-        "camera_access_enabled": user.camera_access_enabled if user.camera_access_enabled is not None else True,
-        "notifications_enabled": user.notifications_enabled if user.notifications_enabled is not None else True,
-        "add_to_home_enabled": user.add_to_home_enabled if user.add_to_home_enabled is not None else False
-    }), 200
+    cache_key = f"user:{user_id}:prefs"
+    payload = get_cached(cache_key, shared_only=True)
+    if payload is None:
+        user = load_user(user_id, *PREFERENCE_COLUMNS)
+        if not user:
+            return json_response({"error": "User not found"}), 404
+        
+        payload = dumps({
+            "theme": user.theme,
+            "language": user.language,
+            "camera_access_enabled": user.camera_access_enabled,
+            "notifications_enabled": user.notifications_enabled,
+            "add_to_home_enabled": user.add_to_home_enabled
+        })
+        set_cached(cache_key, payload, USER_CACHE_TTL, shared_only=True)
+    
+    return private_json_response(payload)
 
 
 @app.route('/api/settings/preferences', methods=['PUT'])
 @jwt_required()
+@transactional()
 def update_preferences():
     """Update user preferences"""
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({"error": "User not found"}), 404
-    
     data = request.get_json()
+    values = {}
     
     if 'theme' in data:
         if data['theme'] in ['light', 'dark']:
-            user.theme = data['theme']
+            values['theme'] = data['theme']
         else:
-            return jsonify({"error": "Invalid theme. Must be 'light' or 'dark'"}), 400
+            return json_response({"error": "Invalid theme. Must be 'light' or 'dark'"}), 400
     
     if 'language' in data:
-        user.language = data['language']
+        # The column is NOT NULL; an empty choice means the default language
+        values['language'] = data['language'] or "English"
     
-    if 'camera_access_enabled' in data:
-        user.camera_access_enabled = bool(data['camera_access_enabled'])
+    for field in ('camera_access_enabled', 'notifications_enabled', 'add_to_home_enabled'):
+        if field in data:
+            values[field] = bool(data[field])
     
-    if 'notifications_enabled' in data:
-        user.notifications_enabled = bool(data['notifications_enabled'])
-    
-    if 'add_to_home_enabled' in data:
-        user.add_to_home_enabled = bool(data['add_to_home_enabled'])
-    
-    try:
-        db.session.commit()
-        return jsonify({"message": "Preferences updated successfully"}), 200
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({"error": "Failed to update preferences", "details": str(e)}), 500
+    # One UPDATE by primary key; its row count doubles as the existence check
+    if values:
+        found = db.session.execute(update(User).where(User.id == int(user_id)).values(**values)).rowcount
+    else:
+        found = db.session.query(User.id).filter_by(id=int(user_id)).first() is not None
+    if not found:
+        return json_response({"error": "User not found"}), 404
+    invalidate_user_cache(user_id)
+    return json_response({"message": "Preferences updated successfully"}), 200
 
 
 @app.route('/api/settings/password', methods=['PUT'])
 @jwt_required()
+@transactional()
 def change_password():
     """Change user password"""
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({"error": "User not found"}), 404
-    
+    user_id = int(get_jwt_identity())
     data = request.get_json()
     current_password = data.get("current_password")
     new_password = data.get("new_password")
     
     if not current_password or not new_password:
-        return jsonify({"error": "Current password and new password required"}), 400
+        return json_response({"error": "Current password and new password required"}), 400
     
     if len(new_password) < 6:
-        return jsonify({"error": "New password must be at least 6 characters"}), 400
+        return json_response({"error": "New password must be at least 6 characters"}), 400
+    
+    # Lock the row until commit so concurrent password changes can't interleave between verify and update
+    row = db.session.execute(
+        select(User.password).where(User.id == user_id).with_for_update()
+    ).first()
+    if row is None:
+        return json_response({"error": "User not found"}), 404
     
     # Verify current password
-    if not check_password_hash(user.password, current_password):
-        return jsonify({"error": "Current password is incorrect"}), 401
+    if not verify_password(row.password, current_password):
+        return json_response({"error": "Current password is incorrect"}), 401
     
     # Update password
-    user.password = generate_password_hash(new_password)
-    
-    try:
-        db.session.commit()
-        return jsonify({"message": "Password changed successfully"}), 200
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({"error": "Failed to change password", "details": str(e)}), 500
+    db.session.execute(update(User).where(User.id == user_id).values(password=hash_password(new_password)))
+    return json_response({"message": "Password changed successfully"}), 200
+
+
+# Rows removed per transaction when clearing history, so a long history never holds the write lock for long
+HISTORY_DELETE_CHUNK = 1000
 
 
 @app.route('/api/settings/history/clear', methods=['DELETE'])
 @jwt_required()
+@transactional()
 def clear_listening_history():
     """Clear user's listening history"""
     user_id = get_jwt_identity()
     
-    try:
-        # Delete all song history for the user
-        SongHistory.query.filter_by(user_id=user_id).delete()
+    # Delete the user's song history a chunk at a time, committing between chunks
+    while True:
+        history_ids = db.session.scalars(
+            select(SongHistory.id).filter_by(user_id=user_id).limit(HISTORY_DELETE_CHUNK)
+        ).all()
+        if not history_ids:
+            break
+        SongHistory.query.filter(SongHistory.id.in_(history_ids)).delete(synchronize_session=False)
         db.session.commit()
-        return jsonify({"message": "Listening history cleared successfully"}), 200
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({"error": "Failed to clear history", "details": str(e)}), 500
+    return json_response({"message": "Listening history cleared successfully"}), 200
+
+
+# The deleting marker has to outlive every token issued before the deletion
+DELETING_MARKER_TTL = int((app.config["JWT_ACCESS_TOKEN_EXPIRES"] or datetime.timedelta(days=30)).total_seconds())
+
+# Account deletions run off the request thread; one worker keeps them from competing for DB connections
+account_deletion_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="account-deletion")
+
+
+def delete_user_data(user_id):
+    """Delete a user and all associated data in one transaction (runs on account_deletion_executor).
+
+    On failure the user keeps is_deleting set, so the account stays locked and init-db retries it.
+    """
+    with app.app_context():
+        try:
+            # Write out this process's queued gesture/voice logs first; other workers' rows for the user
+            # fail their foreign key (where enforced) once it is gone and are dropped one by one by the log buffer
+            flush_log_buffer()
+            
+            # One bulk DELETE per table; nothing from these tables is loaded in the session, so skip synchronizing it
+            for model in (EmotionLog, VoiceCommandLog, GestureLog, LikedSong, SongHistory, UserAvatar):
+                model.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+            
+            # Delete all songs of the user's playlists in one statement, then the playlists
+            user_playlist_ids = db.session.query(Playlist.id).filter_by(user_id=user_id)
+            PlaylistSong.query.filter(PlaylistSong.playlist_id.in_(user_playlist_ids)).delete(synchronize_session=False)
+            Playlist.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+            
+            # Finally, delete the user
+            User.query.filter_by(id=user_id).delete(synchronize_session=False)
+            invalidate_user_cache(user_id)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            logger.exception("Failed to delete account %s", user_id)
 
 
 @app.route('/api/settings/account/delete', methods=['DELETE'])
 @jwt_required()
 def delete_account():
     """Delete user account and all associated data"""
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({"error": "User not found"}), 404
-    
-    try:
-        # Delete all associated data
-        EmotionLog.query.filter_by(user_id=user_id).delete()
-        VoiceCommandLog.query.filter_by(user_id=user_id).delete()
-        GestureLog.query.filter_by(user_id=user_id).delete()
-        LikedSong.query.filter_by(user_id=user_id).delete()
-        SongHistory.query.filter_by(user_id=user_id).delete()
-        
-        # Delete user playlists and their songs
-        playlists = Playlist.query.filter_by(user_id=user_id).all()
-        for playlist in playlists:
-            PlaylistSong.query.filter_by(playlist_id=playlist.id).delete()
-        Playlist.query.filter_by(user_id=user_id).delete()
-        
-        # Finally, delete the user
-        db.session.delete(user)
-        db.session.commit()
-        
-        return jsonify({"message": "Account deleted successfully"}), 200
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({"error": "Failed to delete account", "details": str(e)}), 500
-
-
-@app.route('/api/settings/spotify/unlink', methods=['DELETE'])
-@jwt_required()
-def unlink_spotify():
-    """Unlink Spotify account from user"""
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({"error": "User not found"}), 404
+    user_id = int(get_jwt_identity())
+    # Lock the account before answering: login checks the flag, the token check the cache marker
+    if not db.session.execute(update(User).where(User.id == user_id).values(is_deleting=True)).rowcount:
+        return json_response({"error": "User not found"}), 404
+    invalidate_user_cache(user_id)
+    db.session.commit()
+    set_cached(f"user:{user_id}:deleting", b"1", DELETING_MARKER_TTL)
     
-    try:
-        # Clear Spotify-related fields
-        user.spotify_id = None
-        user.spotify_display_name = None
-        user.spotify_email = None
-        user.spotify_access_token = None
-        user.spotify_refresh_token = None
-        
-        db.session.commit()
-        return jsonify({"message": "Spotify account unlinked successfully"}), 200
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({"error": "Failed to unlink Spotify account", "details": str(e)}), 500
+    # Everything is removed in one transaction on the worker, so a failure leaves the locked account intact
+    account_deletion_executor.submit(delete_user_data, user_id)
+    return json_response({"message": "Account deletion started"}), 202
 
 
-@app.route('/api/settings/google/unlink', methods=['DELETE'])
+@app.route('/api/settings/oauth/<provider>/unlink', methods=['DELETE'])
+# Older per-provider URLs, still used by deployed frontends
+@app.route('/api/settings/<any(spotify, google):provider>/unlink', methods=['DELETE'])
 @jwt_required()
-def unlink_google():
-    """Unlink Google account from user"""
+@transactional()
+def unlink_oauth(provider):
+    """Unlink a Spotify or Google account from user"""
+    values = OAUTH_UNLINK_VALUES.get(provider)
+    if values is None:
+        return json_response({"error": "Unknown provider"}), 404
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({"error": "User not found"}), 404
     
-    try:
-        # Clear Google-related fields
-        user.google_id = None
-        user.google_email = None
-        user.google_name = None
-        user.google_access_token = None
-        user.google_refresh_token = None
-        
-        db.session.commit()
-        return jsonify({"message": "Google account unlinked successfully"}), 200
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({"error": "Failed to unlink Google account", "details": str(e)}), 500
+    # Clear the provider's fields in one UPDATE
+    if not db.session.execute(update(User).where(User.id == int(user_id)).values(**values)).rowcount:
+        return json_response({"error": "User not found"}), 404
+    invalidate_user_cache(user_id)
+    return json_response({"message": f"{provider.capitalize()} account unlinked successfully"}), 200
 
 
 @app.route('/api/profile', methods=['GET'])
@@ -2259,41 +2314,48 @@ def unlink_google():
 def get_profile():
     """Get user profile information"""
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({"error": "User not found"}), 404
+    cache_key = f"user:{user_id}:profile"
+    payload = get_cached(cache_key, shared_only=True)
+    if payload is None:
+        user = db.session.execute(PROFILE_SELECT.where(User.id == int(user_id))).one_or_none()
+        if not user:
+            return json_response({"error": "User not found"}), 404
+        
+        payload = dumps({
+            "id": user.id,
+            "email": user.email,
+            "first_name": user.first_name,
+            "username": user.username,
+            "phone_number": user.phone_number,
+            "bio": user.bio,
+            "profile_picture_url": resolve_picture_url(user.profile_picture_url),
+            "spotifyLinked": bool(user.spotify_linked),
+            "spotifyUser": {
+                "id": user.spotify_id,
+                "name": user.spotify_display_name,
+                "email": user.spotify_email
+            } if user.spotify_linked else None,
+            "googleLinked": bool(user.google_id),
+            "googleUser": {
+                "id": user.google_id,
+                "name": user.google_name,
+                "email": user.google_email
+            } if user.google_id else None
+        })
+        set_cached(cache_key, payload, USER_CACHE_TTL, shared_only=True)
     
-    return jsonify({
-        "id": user.id,
-        "email": user.email,
-        "first_name": user.first_name,
-        "username": user.username,
-        "phone_number": user.phone_number,
-        "bio": user.bio,
-        "profile_picture_url": user.profile_picture_url,
-        "spotifyLinked": bool(user.spotify_access_token),
-        "spotifyUser": {
-            "id": user.spotify_id,
-            "name": user.spotify_display_name,
-            "email": user.spotify_email
-        } if user.spotify_access_token else None,
-        "googleLinked": bool(user.google_id),
-        "googleUser": {
-            "id": user.google_id,
-            "name": user.google_name,
-            "email": user.google_email
-        } if user.google_id else None
-    }), 200
+    return private_json_response(payload)
 
 
 @app.route('/api/profile', methods=['PUT'])
 @jwt_required()
+@transactional(conflict_message="Username already taken")
 def update_profile():
     """Update user profile information"""
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = load_user(user_id, *PROFILE_EDIT_COLUMNS)
     if not user:
-        return jsonify({"error": "User not found"}), 404
+        return json_response({"error": "User not found"}), 404
     
     data = request.get_json()
     
@@ -2301,12 +2363,7 @@ def update_profile():
         user.first_name = data['first_name']
     
     if 'username' in data:
-        # Skip check if username hasn't changed
-        if user.username != data['username']:
-            # Check if username is already taken by another user
-            existing_user = User.query.filter_by(username=data['username']).first()
-            if existing_user and existing_user.id != int(user_id):
-                return jsonify({"error": "Username already taken"}), 409
+        # Uniqueness is enforced by the users.username constraint (a clash becomes a 409 on commit)
         user.username = data['username']
     
     if 'phone_number' in data:
@@ -2315,60 +2372,182 @@ def update_profile():
     if 'bio' in data:
         user.bio = data['bio']
     
-    try:
-        db.session.commit()
-        return jsonify({"message": "Profile updated successfully"}), 200
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({"error": "Failed to update profile", "details": str(e)}), 500
+    invalidate_user_cache(user_id)
+    return json_response({"message": "Profile updated successfully"}), 200
+
+
+# Image types served back from /api/profile/picture/<id> (no SVG, which can carry scripts)
+PROFILE_PICTURE_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp"}
+
+
+def resolve_picture_url(url):
+    """Backfilled avatars store a host-relative path; make it absolute for this request's host"""
+    if url and url.startswith("/"):
+        return urllib.parse.urljoin(request.host_url, url)
+    return url
 
 
 @app.route('/api/profile/picture', methods=['POST'])
 @jwt_required()
+@transactional()
 def upload_profile_picture():
     """Upload profile picture (base64 encoded)"""
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({"error": "User not found"}), 404
-    
+    user_id = int(get_jwt_identity())
     data = request.get_json()
     image_data = data.get("image")
     
     if not image_data:
-        return jsonify({"error": "Image data required"}), 400
+        return json_response({"error": "Image data required"}), 400
     
-    # Store the base64 image data URL directly
-    # In production, you might want to upload to S3 or similar and store the URL
-    user.profile_picture_url = image_data
+    # Split "data:image/png;base64,..." into its content type and payload
+    header, _, encoded = image_data.rpartition(",")
+    content_type = header[len("data:"):].split(";", 1)[0] if header.startswith("data:") else "image/jpeg"
+    if content_type not in PROFILE_PICTURE_TYPES:
+        return json_response({"error": "Unsupported image type"}), 400
     
+    # Reject oversized uploads before decoding (base64 expands 3 bytes into 4 chars)
+    if (len(encoded) * 3) // 4 > app.config["MAX_IMAGE_UPLOAD_BYTES"]:
+        return json_response({"error": "Image too large"}), 413
     try:
-        db.session.commit()
-        return jsonify({
-            "message": "Profile picture uploaded successfully",
-            "profile_picture_url": user.profile_picture_url
-        }), 200
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({"error": "Failed to upload profile picture", "details": str(e)}), 500
+        image_bytes = b64decode(encoded, validate=True)
+    except ValueError:
+        return json_response({"error": "Invalid image data"}), 400
+    
+    # Store the bytes in their own table and keep only a short URL on the user. The random token
+    # makes the URL unguessable (ids alone would let anyone walk every avatar) and busts caches per upload.
+    token = secrets.token_urlsafe(16)
+    profile_picture_url = url_for('get_profile_picture', user_id=user_id, v=token, _external=True)
+    
+    if not db.session.execute(update(User).where(User.id == user_id).values(profile_picture_url=profile_picture_url)).rowcount:
+        return json_response({"error": "User not found"}), 404
+    UserAvatar.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+    db.session.add(UserAvatar(user_id=user_id, content_type=content_type, data=image_bytes, token=token))
+    invalidate_user_cache(user_id)
+    return json_response({
+        "message": "Profile picture uploaded successfully",
+        "profile_picture_url": profile_picture_url
+    }), 200
+
+
+@app.route('/api/profile/picture/<int:user_id>', methods=['GET'])
+def get_profile_picture(user_id):
+    """Serve a stored profile picture to anyone holding its URL (no auth, so it works as an <img> src)"""
+    avatar = db.session.get(UserAvatar, user_id)
+    if not avatar or not avatar.token or not secrets.compare_digest(avatar.token, request.args.get("v", "")):
+        return json_response({"error": "Profile picture not found"}), 404
+    
+    response = app.response_class(avatar.data, mimetype=avatar.content_type)
+    # Each upload gets a new token, so each URL can be cached forever
+    response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    response.headers["X-Content-Type-Options"] = "nosniff"
+    return response
 
 
 # ======================================================
 # 6️⃣  Global Error Handlers
 # ======================================================
+# Fixed bodies for the error paths, serialized once instead of on every failure
+ERROR_500_BODY = b'{"error":"Internal Server Error"}'
+ERROR_409_BODY = b'{"error":"Conflict with existing data"}'
+
+
+@app.errorhandler(IntegrityError)
+def handle_integrity_error(e):
+    db.session.rollback()
+    return app.response_class(ERROR_409_BODY, status=409, mimetype='application/json')
+
+
 @app.errorhandler(Exception)
 def handle_500(e):
-    return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
+    # Routing errors (404, 405, ...) keep their own status instead of becoming a logged 500
+    if isinstance(e, HTTPException):
+        return e
+    logger.exception("Unhandled exception")
+    # Exception text can expose internals (SQL, paths), so only show it in debug mode
+    if app.debug:
+        return json_response({"error": "Internal Server Error", "message": str(e)}), 500
+    return app.response_class(ERROR_500_BODY, status=500, mimetype='application/json')
 
 
 # ======================================================
 # 7️⃣  Init DB
 # ======================================================
-with app.app_context():
+def add_missing_columns():
+    """Add model columns that existing tables predate; create_all only creates whole tables"""
+    inspector = inspect(db.engine)
+    preparer = db.engine.dialect.identifier_preparer
+    with db.engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    # New columns must be nullable or carry a server_default for rows that already exist
+                    column_sql = CreateColumn(column).compile(dialect=db.engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {column_sql}"))
+                    logger.info("Added column %s.%s", table.name, column.name)
+
+
+def backfill_profile_pictures():
+    """Move profile pictures still stored inline as data: URLs on users into user_avatars"""
+    rows = db.session.execute(
+        select(User.id, User.profile_picture_url).where(User.profile_picture_url.like("data:%"))
+    ).all()
+    for user_id, data_url in rows:
+        header, _, encoded = data_url.rpartition(",")
+        content_type = header[len("data:"):].split(";", 1)[0]
+        try:
+            image_bytes = b64decode(encoded)
+        except ValueError:
+            image_bytes = None
+        if content_type not in PROFILE_PICTURE_TYPES or not image_bytes:
+            logger.warning("Left unreadable inline profile picture of user %s in place", user_id)
+            continue
+        
+        token = secrets.token_urlsafe(16)
+        # No request here to take a host from, so store the path; readers resolve it per request
+        with app.test_request_context():
+            profile_picture_url = url_for('get_profile_picture', user_id=user_id, v=token)
+        db.session.merge(UserAvatar(user_id=user_id, content_type=content_type, data=image_bytes, token=token))
+        db.session.execute(update(User).where(User.id == user_id).values(profile_picture_url=profile_picture_url))
+        invalidate_user_cache(user_id)
+    db.session.commit()
+
+
+def backfill_preference_defaults():
+    """Fill preference columns that are still NULL on rows created before they had defaults"""
+    for column, value in PREFERENCE_DEFAULTS.items():
+        db.session.execute(update(User).where(column.is_(None)).values({column: value}))
+    db.session.commit()
+
+
+def create_tables():
+    """Create missing tables and backfill defaults; run once per deploy, not on every worker import"""
     db.create_all()
-    print("✅ Database initialized successfully!")
+    add_missing_columns()
+    # create_all skips tables that already exist, so add indexes introduced since they were created
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+    backfill_preference_defaults()
+    backfill_profile_pictures()
+    # Finish deletions whose background job failed or died with its worker
+    for user_id in db.session.scalars(select(User.id).where(User.is_deleting)).all():
+        delete_user_data(user_id)
+    if not app.config.get("TESTING"):
+        print("✅ Database initialized successfully!")
+
+
+@app.cli.command("init-db")
+def init_db():
+    """Create the database tables (flask --app app init-db)"""
+    create_tables()
+
 
 if __name__ == '__main__':
+    with app.app_context():
+        create_tables()
     print(f"------------ CONFIG DEBUG ------------")
     print(f"Loaded SPOTIFY_CLIENT_ID: {app.config['SPOTIFY_CLIENT_ID']}")
     print(f"Loaded SPOTIFY_REDIRECT_URI: '{app.config['SPOTIFY_REDIRECT_URI']}'")
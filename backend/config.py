@@ -9,6 +9,16 @@ load_dotenv(dotenv_path=env_path)
 class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///moodmusic.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Pool sizing only applies to server databases; SQLite keeps SQLAlchemy's default pool
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        **({} if SQLALCHEMY_DATABASE_URI.startswith("sqlite") else {
+            "pool_size": int(os.getenv("DB_POOL_SIZE", 10)),
+            "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 20)),
+            "pool_timeout": 30,
+        }),
+    }
     SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret")
     SPOTIFY_CLIENT_ID = os.getenv("SPOTIFY_CLIENT_ID")
     SPOTIFY_CLIENT_SECRET = os.getenv("SPOTIFY_CLIENT_SECRET")
@@ -17,4 +27,12 @@ class Config:
     GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
     GOOGLE_REDIRECT_URI = os.getenv("GOOGLE_REDIRECT_URI")
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "dev-jwt-secret-key-change-in-production")
-
+    REDIS_URL = os.getenv("REDIS_URL")
+    SPOTIFY_MAX_RPS = int(os.getenv("SPOTIFY_MAX_RPS", 10))
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", 600))
+    RESPONSE_CACHE_STALE_AFTER = int(os.getenv("RESPONSE_CACHE_STALE_AFTER", 300))
+    MAX_IMAGE_UPLOAD_BYTES = int(os.getenv("MAX_IMAGE_UPLOAD_BYTES", 5 * 1024 * 1024))
+    # Log requests that run more SQL queries than this (N+1 detection in development); 0 disables
+    QUERY_COUNT_WARN = int(os.getenv("QUERY_COUNT_WARN", 0))
+    # Response key order doesn't matter to the frontend, so skip sorting every dict
+    JSON_SORT_KEYS = False
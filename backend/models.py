@@ -20,11 +20,18 @@ class User(db.Model):
     profile_picture_url = db.Column(db.String(500))
 
     # Preferences
-    theme = db.Column(db.String(20), default='light')  # 'light' or 'dark'
-    language = db.Column(db.String(50), default='English')
-    camera_access_enabled = db.Column(db.Boolean, default=True)
-    notifications_enabled = db.Column(db.Boolean, default=True)
-    add_to_home_enabled = db.Column(db.Boolean, default=False)
+    theme = db.Column(db.String(20), nullable=False, default='light', server_default='light')  # 'light' or 'dark'
+    language = db.Column(db.String(50), nullable=False, default='English', server_default='English')
+    camera_access_enabled = db.Column(db.Boolean, nullable=False, default=True, server_default=db.true())
+    notifications_enabled = db.Column(db.Boolean, nullable=False, default=True, server_default=db.true())
+    add_to_home_enabled = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
+
+    # Set when the user asks to delete their account; the account is locked until the deletion job removes it
+    is_deleting = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
+
+    # Denormalized copy of the newest EmotionLog row
+    latest_emotion = db.Column(db.String(50))
+    latest_emotion_at = db.Column(db.DateTime)
 
     # Spotify fields
     spotify_id = db.Column(db.String(120), unique=True)
@@ -32,6 +39,7 @@ class User(db.Model):
     spotify_email = db.Column(db.String(120), unique=True)
     spotify_access_token = db.Column(db.Text)
     spotify_refresh_token = db.Column(db.Text)
+    spotify_token_expires_at = db.Column(db.DateTime)
 
     # Google fields
     google_id = db.Column(db.String(120), unique=True)
@@ -44,6 +52,15 @@ class User(db.Model):
     voice_commands = db.relationship('VoiceCommandLog', backref='user', lazy=True)
     gestures = db.relationship('GestureLog', backref='user', lazy=True)
 
+class UserAvatar(db.Model):
+    # Profile picture bytes, kept out of the users row so user loads never drag them along
+    __tablename__ = 'user_avatars'
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    content_type = db.Column(db.String(50), nullable=False)
+    data = db.Column(db.LargeBinary, nullable=False)
+    token = db.Column(db.String(32))  # random per upload; required in the picture URL
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
 class EmotionLog(db.Model):
     __tablename__ = 'emotion_logs'  # ✅ Explicit name
     id = db.Column(db.Integer, primary_key=True)
@@ -51,6 +68,9 @@ class EmotionLog(db.Model):
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
 
+    # serves the "latest emotion for user" lookup as an index range scan
+    __table_args__ = (db.Index('ix_emotion_logs_user_id_timestamp', 'user_id', db.text('timestamp DESC')),)
+
 class PlaylistMapping(db.Model):
     __tablename__ = 'playlist_mappings'  # ✅ Explicit name
     id = db.Column(db.Integer, primary_key=True)
@@ -64,6 +84,8 @@ class VoiceCommandLog(db.Model):
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
 
+    __table_args__ = (db.Index('ix_voice_command_logs_user_id', 'user_id'),)
+
 class GestureLog(db.Model):
     __tablename__ = 'gesture_logs'  # ✅ Explicit name
     id = db.Column(db.Integer, primary_key=True)
@@ -71,6 +93,8 @@ class GestureLog(db.Model):
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
 
+    __table_args__ = (db.Index('ix_gesture_logs_user_id', 'user_id'),)
+
 class Song(db.Model):
     __tablename__ = 'songs'
     id = db.Column(db.String, primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -95,6 +119,8 @@ class Playlist(db.Model):
     user = db.relationship('User', backref='playlists')
     songs = db.relationship('PlaylistSong', back_populates='playlist', cascade="all, delete")
 
+    __table_args__ = (db.Index('ix_playlists_user_id', 'user_id'),)
+
 class PlaylistSong(db.Model):
     __tablename__ = 'playlist_songs'
     playlist_id = db.Column(db.String, db.ForeignKey('playlists.id'), primary_key=True)
@@ -141,3 +167,6 @@ class SongHistory(db.Model):
     title = db.Column(db.String(255))
     artist = db.Column(db.String(255))
     album = db.Column(db.String(255))
+
+    # per-user history reads and deletes; liked_songs and emotion_logs are covered by their user_id-leading keys
+    __table_args__ = (db.Index('ix_song_history_user_id', 'user_id'),)
@@ -0,0 +1,163 @@
+import logging
+import threading
+import time
+import redis
+from flask import Response, current_app, has_app_context
+from config import Config
+from utils.responses import dumps
+
+logger = logging.getLogger(__name__)
+
+LOCAL_CACHE_MAX_ENTRIES = 256
+
+_redis_client = None
+_local_cache = {}  # key -> (expires_at, payload)
+_local_lock = threading.Lock()
+
+
+def get_redis_client():
+    """Lazily connect to REDIS_URL; returns None when Redis is not configured"""
+    global _redis_client
+    if _redis_client is None:
+        # Spotify pool threads run outside the app context, so fall back to the static config there
+        redis_url = current_app.config.get('REDIS_URL') if has_app_context() else Config.REDIS_URL
+        if redis_url:
+            _redis_client = redis.Redis.from_url(redis_url, socket_timeout=0.5)
+    return _redis_client
+
+
+def get_cached(key, shared_only=False):
+    """Cached payload for key or None; shared_only skips the in-process fallback"""
+    client = get_redis_client()
+    if client is not None:
+        try:
+            return client.get(key)
+        except redis.RedisError as e:
+            logger.warning("Redis get failed for '%s': %s", key, e)
+            return None
+    if shared_only:
+        return None
+
+    with _local_lock:
+        entry = _local_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at < time.monotonic():
+            del _local_cache[key]
+            return None
+        return payload
+
+
+def set_cached(key, payload, ttl, shared_only=False):
+    """Cache payload for ttl seconds; shared_only skips the in-process fallback (for data other workers may invalidate)"""
+    client = get_redis_client()
+    if client is not None:
+        try:
+            client.setex(key, ttl, payload)
+        except redis.RedisError as e:
+            logger.warning("Redis set failed for '%s': %s", key, e)
+        return
+    if shared_only:
+        return
+
+    now = time.monotonic()
+    with _local_lock:
+        _store_local(key, payload, now + ttl, now)
+
+
+def delete_cached(*keys):
+    client = get_redis_client()
+    if client is not None:
+        try:
+            client.delete(*keys)
+        except redis.RedisError as e:
+            logger.warning("Redis delete failed for %s: %s", keys, e)
+        return
+
+    with _local_lock:
+        for key in keys:
+            _local_cache.pop(key, None)
+
+
+def incr_counter(key, ttl):
+    """Increment a counter that expires ttl seconds after its first hit; returns the new count"""
+    client = get_redis_client()
+    if client is not None:
+        try:
+            pipe = client.pipeline()
+            pipe.incr(key)
+            pipe.expire(key, ttl)
+            return pipe.execute()[0]
+        except redis.RedisError as e:
+            logger.warning("Redis incr failed for '%s': %s", key, e)
+
+    now = time.monotonic()
+    with _local_lock:
+        entry = _local_cache.get(key)
+        if entry is None or entry[0] < now:
+            entry = (now + ttl, 0)
+        _store_local(key, entry[1] + 1, entry[0], now)
+        return entry[1] + 1
+
+
+def _store_local(key, value, expires_at, now):
+    """Write to the in-process cache; caller must hold _local_lock"""
+    if key not in _local_cache and len(_local_cache) >= LOCAL_CACHE_MAX_ENTRIES:
+        # Drop expired entries first, then the one closest to expiry
+        for stale_key in [k for k, (exp, _) in _local_cache.items() if exp < now]:
+            del _local_cache[stale_key]
+        if len(_local_cache) >= LOCAL_CACHE_MAX_ENTRIES:
+            del _local_cache[min(_local_cache, key=lambda k: _local_cache[k][0])]
+    _local_cache[key] = (expires_at, value)
+
+
+def claim_refresh(key, ttl):
+    """Set key if it is absent; True means this caller won it (SET NX)"""
+    client = get_redis_client()
+    if client is not None:
+        try:
+            return bool(client.set(key, b"1", nx=True, ex=ttl))
+        except redis.RedisError as e:
+            logger.warning("Redis set failed for '%s': %s", key, e)
+
+    now = time.monotonic()
+    with _local_lock:
+        entry = _local_cache.get(key)
+        if entry is not None and entry[0] >= now:
+            return False
+        _store_local(key, b"1", now + ttl, now)
+        return True
+
+
+def cached_response(key):
+    """Look up the cached JSON body for key; returns (response, stale_payload).
+
+    response is set on a hit. Once an entry is older than RESPONSE_CACHE_STALE_AFTER, the first caller
+    gets response=None plus the stale payload and rebuilds it, while everyone else keeps being served
+    the stale copy (stale-while-revalidate). If the rebuild fails, pass the stale payload to
+    cache_response/fallback_response so that caller is served it too.
+    """
+    payload = get_cached(key)
+    if payload is None:
+        return None, None
+    if claim_refresh(f"{key}:fresh", current_app.config['RESPONSE_CACHE_STALE_AFTER']):
+        return None, payload
+    return Response(payload, mimetype='application/json'), None
+
+
+def fallback_response(stale=None):
+    """The stale cached body when there is one, else an empty JSON list (for failed rebuilds)"""
+    return Response(stale if stale is not None else b"[]", mimetype='application/json')
+
+
+def cache_response(key, data, ttl=None, stale=None):
+    """Serialize data once, cache the bytes under key and return them as a response"""
+    # Don't pin an empty result (e.g. Spotify outage) for a whole TTL; keep serving the stale copy instead
+    if not data and stale is not None:
+        return fallback_response(stale)
+    payload = dumps(data)
+    if data:
+        set_cached(key, payload, ttl or current_app.config['RESPONSE_CACHE_TTL'])
+        set_cached(f"{key}:fresh", b"1", current_app.config['RESPONSE_CACHE_STALE_AFTER'])
+    return Response(payload, mimetype='application/json')
@@ -0,0 +1,80 @@
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from models import db
+
+logger = logging.getLogger(__name__)
+
+# Gesture/voice log rows are queued here and written in batches instead of one commit per event
+LOG_FLUSH_INTERVAL = 1.0  # seconds
+LOG_FLUSH_BATCH = 500
+
+_pending = deque()  # (model, row mapping)
+_flush_lock = threading.Lock()
+_start_lock = threading.Lock()
+_app = None
+_flusher = None
+
+
+def init_log_buffer(app):
+    """Remember the app so the flusher thread can open its own app context"""
+    global _app
+    _app = app
+    atexit.register(flush_log_buffer)
+
+
+def buffer_log(model, **row):
+    """Queue a log row for the next batched insert"""
+    _pending.append((model, row))
+    _ensure_flusher()
+
+
+def flush_log_buffer():
+    """Insert everything queued so far, one bulk insert per model and a single commit"""
+    with _flush_lock:
+        while _pending:
+            batch = {}
+            for _ in range(min(len(_pending), LOG_FLUSH_BATCH)):
+                model, row = _pending.popleft()
+                batch.setdefault(model, []).append(row)
+            with _app.app_context():
+                if not _insert(batch):
+                    # One bad row (e.g. its user was deleted by another worker) must not sink the batch:
+                    # retry each model on its own, then row by row, and drop only the rows that still fail
+                    for model, rows in batch.items():
+                        if not _insert({model: rows}):
+                            dropped = sum(not _insert({model: [row]}) for row in rows)
+                            if dropped:
+                                logger.warning("Dropped %d of %d buffered %s rows", dropped, len(rows), model.__name__)
+
+
+def _insert(batch):
+    """Bulk insert {model: rows} in one commit; False (rolled back) if it failed"""
+    try:
+        for model, rows in batch.items():
+            db.session.bulk_insert_mappings(model, rows)
+        db.session.commit()
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.debug("Buffered log insert failed: %s", e)
+        return False
+
+
+def _ensure_flusher():
+    global _flusher
+    if _flusher is not None:
+        return
+    with _start_lock:
+        if _flusher is None:
+            _flusher = threading.Thread(target=_flush_forever, name="log-buffer-flusher", daemon=True)
+            _flusher.start()
+
+
+def _flush_forever():
+    while True:
+        time.sleep(LOG_FLUSH_INTERVAL)
+        if _pending:
+            flush_log_buffer()
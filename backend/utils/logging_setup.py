@@ -0,0 +1,23 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+
+_listener = None
+
+
+def configure_logging(level=logging.INFO):
+    """Route log records through a queue so a background thread does the stream I/O, not the worker"""
+    global _listener
+    if _listener is not None:
+        return
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    root = logging.getLogger()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
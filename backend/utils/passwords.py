@@ -0,0 +1,28 @@
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from werkzeug.security import check_password_hash
+
+# 2 passes over 64 MiB: memory-hard, but far less CPU per login than 600k PBKDF2 rounds
+_hasher = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=1)
+
+
+def hash_password(password):
+    """Hash a new password with Argon2id"""
+    return _hasher.hash(password)
+
+
+def verify_password(password_hash, password):
+    """Check password against a stored Argon2 or legacy werkzeug hash"""
+    if not password_hash or password is None:
+        return False
+    if password_hash.startswith("$argon2"):
+        try:
+            return _hasher.verify(password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    return check_password_hash(password_hash, password)
+
+
+def needs_rehash(password_hash):
+    """True when a stored hash is legacy PBKDF2 or predates the current Argon2 parameters"""
+    return not password_hash.startswith("$argon2") or _hasher.check_needs_rehash(password_hash)
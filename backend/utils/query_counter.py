@@ -0,0 +1,25 @@
+import logging
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+def init_query_counter(app):
+    """Warn about requests that run more than QUERY_COUNT_WARN queries (0 disables), to catch N+1 regressions"""
+    threshold = app.config.get("QUERY_COUNT_WARN", 0)
+    if not threshold:
+        return
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        if has_request_context():
+            g.query_count = g.get("query_count", 0) + 1
+
+    @app.after_request
+    def _warn_on_query_count(response):
+        count = g.get("query_count", 0)
+        if count > threshold:
+            logger.warning("%s %s ran %d queries (limit %d)", request.method, request.path, count, threshold)
+        return response
@@ -0,0 +1,43 @@
+import orjson
+from flask import current_app, request
+from flask.json.provider import DefaultJSONProvider
+
+
+def dumps(data):
+    """Serialize data to a JSON response body"""
+    return orjson.dumps(data)
+
+
+def json_response(data):
+    """JSON response built with the shared serializer; used instead of jsonify() on every endpoint"""
+    return current_app.response_class(dumps(data), mimetype='application/json')
+
+
+def private_json_response(payload):
+    """Per-user JSON body that browsers must revalidate; a matching If-None-Match gets a 304"""
+    response = current_app.response_class(payload, mimetype='application/json')
+    response.headers["Cache-Control"] = "private, no-cache"
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, so jsonify() and request.get_json() skip stdlib json"""
+
+    def dumps(self, obj, **kwargs):
+        # Dates still go through Flask's default() so they keep the HTTP date format
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=kwargs.get("default", self.default), option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+def init_json_provider(app):
+    """Use orjson for the app's JSON encoding and decoding"""
+    app.json = OrjsonProvider(app)
+    app.json.sort_keys = app.config.get("JSON_SORT_KEYS", True)
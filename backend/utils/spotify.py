@@ -1,35 +1,195 @@
+import ijson
+import itertools
+import logging
+import threading
+import time
 import requests
+from orjson import loads as json_loads
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from flask import current_app
 from base64 import b64encode
+from config import Config
+from utils.cache import incr_counter
+
+logger = logging.getLogger(__name__)
+
+# Shared pool for Spotify fan-out; its size caps concurrent calls across all requests
+SPOTIFY_MAX_CONCURRENCY = 5
+_spotify_executor = ThreadPoolExecutor(max_workers=SPOTIFY_MAX_CONCURRENCY)
+
+# Requests per second allowed across all workers (counted in Redis when it is configured)
+SPOTIFY_MAX_RPS = Config.SPOTIFY_MAX_RPS
+
+# Longest Retry-After (seconds) a Spotify call will sleep for before retrying
+SPOTIFY_MAX_RETRY_AFTER = 2.0
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that delays requests once the shared per-second Spotify budget is used up"""
+
+    def send(self, request, **kwargs):
+        count = incr_counter(f"sp_rl:{int(time.time())}", 2)
+        if count > SPOTIFY_MAX_RPS:
+            # Spread the overflow across the following seconds instead of bursting into a 429
+            time.sleep(min((count - SPOTIFY_MAX_RPS) / SPOTIFY_MAX_RPS, 2.0))
+        return super().send(request, **kwargs)
+
+
+class CappedRetry(Retry):
+    """Retry that honours Retry-After only up to SPOTIFY_MAX_RETRY_AFTER seconds.
+
+    urllib3 otherwise sleeps for whatever Spotify asks, which can pin request and pool threads
+    past the worker timeout; a longer wait just lets the last 429 through to the caller.
+    """
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, SPOTIFY_MAX_RETRY_AFTER)
+
+
+# One keep-alive session for all Spotify calls so TLS connections are reused across requests.
+# Retry honours (capped) Retry-After on 429 responses.
+spotify_session = requests.Session()
+spotify_session.mount("https://", RateLimitedAdapter(
+    pool_connections=20,
+    pool_maxsize=50,
+    # raise_on_status=False hands the last 429/5xx back as a response (callers check status_code)
+    # instead of raising RetryError once the retries are used up
+    max_retries=CappedRetry(total=2, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)
+))
+
+# URL -> (ETag, body) of browse responses, revalidated with If-None-Match
+_etag_cache = {}
+_etag_lock = threading.Lock()
+
+# Client-credentials token shared by all requests until shortly before it expires
+_token_cache = {"token": None, "expires_at": 0.0}
+_token_lock = threading.Lock()
+
 
 def get_spotify_token():
+    if time.monotonic() < _token_cache["expires_at"]:
+        return _token_cache["token"]
+    with _token_lock:
+        # Another thread may have refreshed the token while we waited
+        if time.monotonic() < _token_cache["expires_at"]:
+            return _token_cache["token"]
+        return _fetch_spotify_token()
+
+
+def _fetch_spotify_token():
     try:
         client_id = current_app.config.get('SPOTIFY_CLIENT_ID')
         client_secret = current_app.config.get('SPOTIFY_CLIENT_SECRET')
         
         if not client_id or not client_secret:
-            print("⚠️ Spotify credentials not configured")
+            logger.warning("Spotify credentials not configured")
             return None
         
         auth_str = f"{client_id}:{client_secret}"
         b64_auth_str = b64encode(auth_str.encode()).decode()
 
-        res = requests.post(
+        res = spotify_session.post(
             "https://accounts.spotify.com/api/token",
             data={"grant_type": "client_credentials"},
             headers={"Authorization": f"Basic {b64_auth_str}"}
         )
         
         if res.status_code == 200:
-            return res.json().get("access_token")
+            token_data = res.json()
+            access_token = token_data.get("access_token")
+            if access_token:
+                _token_cache["token"] = access_token
+                _token_cache["expires_at"] = time.monotonic() + token_data.get("expires_in", 3600) - 60
+            return access_token
         else:
-            print(f"⚠️ Failed to get Spotify token: {res.status_code} - {res.text}")
+            logger.warning("Failed to get Spotify token: %s - %s", res.status_code, res.text)
             return None
     except Exception as e:
-        print(f"⚠️ Error getting Spotify token: {str(e)}")
+        logger.warning("Error getting Spotify token: %s", e)
         return None
 
 
+def spotify_json(res):
+    """Decode a Spotify response body"""
+    return json_loads(res.content)
+
+
+def _spotify_get_json(url, token, timeout):
+    try:
+        res = spotify_session.get(url, headers={"Authorization": f"Bearer {token}"}, timeout=timeout)
+        if res.status_code == 200:
+            return spotify_json(res)
+        logger.warning("Spotify request failed: %s - %s", res.status_code, url)
+    except Exception as e:
+        logger.warning("Error calling Spotify (%s): %s", url, e)
+    return None
+
+
+def spotify_get_conditional(url, token, timeout=3):
+    """GET a slowly-changing Spotify URL (e.g. browse), reusing the stored body when Spotify answers 304"""
+    headers = {"Authorization": f"Bearer {token}"}
+    cached = _etag_cache.get(url)
+    if cached:
+        headers["If-None-Match"] = cached[0]
+    try:
+        res = spotify_session.get(url, headers=headers, timeout=timeout)
+        if res.status_code == 304 and cached:
+            return json_loads(cached[1])
+        if res.status_code == 200:
+            etag = res.headers.get("ETag")
+            if etag:
+                with _etag_lock:
+                    _etag_cache[url] = (etag, res.content)
+            return spotify_json(res)
+        logger.warning("Spotify request failed: %s - %s", res.status_code, url)
+    except Exception as e:
+        logger.warning("Error calling Spotify (%s): %s", url, e)
+    return None
+
+
+def _spotify_get_items(url, token, path, max_items, timeout):
+    """Read at most max_items entries of the array at path (e.g. "tracks.items") from a Spotify response"""
+    try:
+        with spotify_session.get(url, headers={"Authorization": f"Bearer {token}"}, timeout=timeout, stream=True) as res:
+            if res.status_code != 200:
+                logger.warning("Spotify request failed: %s - %s", res.status_code, url)
+                return None
+            res.raw.decode_content = True
+            items = list(itertools.islice(ijson.items(res.raw, f"{path}.item", use_float=True), max_items))
+            # Drain the unparsed remainder so the keep-alive connection goes back to the pool
+            for _ in res.iter_content(chunk_size=8192):
+                pass
+            return items
+    except Exception as e:
+        logger.warning("Error calling Spotify (%s): %s", url, e)
+    return None
+
+
+def spotify_get_items(url, token, path, max_items, timeout=3):
+    """Stream at most max_items entries of the array at path from one Spotify response; None if the call failed"""
+    return _spotify_get_items(url, token, path, max_items, timeout)
+
+
+def spotify_get_items_many(urls, token, path, max_items, timeout=3):
+    """Concurrent _spotify_get_items over several URLs; returns the item list (or None) for each URL, in order"""
+    return list(_spotify_executor.map(lambda url: _spotify_get_items(url, token, path, max_items, timeout), urls))
+
+
+def spotify_get_async(url, token, timeout=3, conditional=False):
+    """Start a Spotify GET in the shared pool; the future resolves to the parsed JSON or None"""
+    return _spotify_executor.submit(spotify_get_conditional if conditional else _spotify_get_json, url, token, timeout)
+
+
+def spotify_get_many(urls, token, timeout=3):
+    """GET several Spotify URLs concurrently; returns the parsed JSON (or None) for each URL, in order"""
+    return list(_spotify_executor.map(lambda url: _spotify_get_json(url, token, timeout), urls))
+
+
 def get_playlist_for_emotion(emotion):
     emotion_to_playlist = {
         "happy": "1A9oCcZKDOGEaD6d1s3IVo",     # Replace with your actual playlist IDs
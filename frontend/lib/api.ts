@@ -529,7 +529,7 @@ export const settingsAPI = {
   },
 
   unlinkSpotify: async () => {
-    const response = await apiRequest('/api/settings/spotify/unlink', {
+    const response = await apiRequest('/api/settings/oauth/spotify/unlink', {
       method: 'DELETE',
     });
     if (!response.ok) {
@@ -540,7 +540,7 @@ export const settingsAPI = {
   },
 
   unlinkGoogle: async () => {
-    const response = await apiRequest('/api/settings/google/unlink', {
+    const response = await apiRequest('/api/settings/oauth/google/unlink', {
       method: 'DELETE',
     });
     if (!response.ok) {